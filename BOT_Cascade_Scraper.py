@@ -0,0 +1,5 @@
+from phonelytics.gui import main
+from phonelytics.providers import DEFAULT_CASCADE
+
+if __name__ == "__main__":
+    main(DEFAULT_CASCADE)
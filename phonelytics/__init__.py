@@ -0,0 +1,17 @@
+from .engine import ScrapeEngine, format_phone_number, MAX_NUMBERS
+from .loader import iter_lines, iter_numbers, load_numbers
+from .cache import LookupCache
+from .config import load_config
+from .pacing import RatePolicy
+from .connectivity import ConnectivityMonitor
+from .journal import Journal
+from .debugstore import DebugStore
+from .events import EventBus, format_progress
+from .metrics import Metrics
+from .sinks import RESULT_COLUMNS, open_sink, save_results
+from .records import ResultRecord, ResultTable
+from .nanp import NumberFilter, filter_numbers
+from .americanphonebook import AmericanPhoneBookScraper
+from .americanphonebook_http import AmericanPhoneBookHttpScraper
+from .thatsthem import ThatsthemScraper
+from .providers import PROVIDERS, HTTP_PROVIDERS, CascadeProvider, create_provider
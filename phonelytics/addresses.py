@@ -0,0 +1,147 @@
+import os
+import re
+import pandas as pd
+
+STATES_TABLE = os.path.join(os.path.dirname(__file__), 'data', 'states.csv')
+ZIP3_TABLE = os.path.join(os.path.dirname(__file__), 'data', 'zip3.csv')
+
+# Words that start the apartment/suite part of a street address
+UNIT_DESIGNATORS = ["APT", "APARTMENT", "UNIT", "STE", "SUITE", "BLDG", "BUILDING", "FL", "FLOOR", "RM", "ROOM",
+                    "LOT", "TRLR", "SPC", "SPACE", "DEPT", "PH", "#"]
+NAME_SUFFIXES = ["JR", "SR", "II", "III", "IV", "V"]
+
+UNIT_RE = re.compile(r"^(?P<designator>(?:" + "|".join(re.escape(unit) for unit in UNIT_DESIGNATORS if unit != "#")
+                     + r")\b\.?|#)\s*#?\s*(?P<number>\S.*)$", re.IGNORECASE)
+# "28405", "28405-1234" or "28405 1234" at the end of the address
+ZIP_RE = re.compile(r"\b(\d{5})(?:[-\s]?(\d{4}))?\s*$")
+SPACES_RE = re.compile(r"\s+")
+NAME_SUFFIX_RE = re.compile(r"^(?:" + "|".join(NAME_SUFFIXES) + r")\.?$", re.IGNORECASE)
+
+_states = None
+_zip3_ranges = None
+
+
+def states():
+    # State and territory names and codes, both upper-cased, mapped to the code
+    global _states
+    if _states is None:
+        table = pd.read_csv(STATES_TABLE, dtype=str)
+        _states = dict(zip(table['code'], table['code']))
+        _states.update(zip(table['name'].str.upper(), table['code']))
+    return _states
+
+
+def zip3_ranges():
+    global _zip3_ranges
+    if _zip3_ranges is None:
+        table = pd.read_csv(ZIP3_TABLE, dtype=str)
+        _zip3_ranges = list(zip(table['low'], table['high'], table['state']))
+    return _zip3_ranges
+
+
+def state_for_zip(zip_code):
+    # The state a ZIP code belongs to, by its first three digits
+    prefix = zip_code[:3]
+    for low, high, state in zip3_ranges():
+        if low <= prefix <= high:
+            return state
+    return None
+
+
+def clean(text):
+    return SPACES_RE.sub(" ", str(text or "")).strip(" ,")
+
+
+def normalize_state(text):
+    text = clean(text).replace(".", "").upper()
+    return states().get(text) or states().get(text.replace(" ", ""))
+
+
+def normalize_name(raw):
+    # "SMITH, JOHN A" -> "JOHN A SMITH", "SMITH JR, JOHN" -> "JOHN SMITH JR"; spacing is
+    # tidied but the site's capitalization is kept
+    name = clean(raw)
+    if name.count(",") == 1:
+        last, first = [clean(part) for part in name.split(",")]
+        if NAME_SUFFIX_RE.match(first):
+            return f"{last} {first}"
+        if first and last:
+            last_words = last.split()
+            suffix = [word for word in last_words[1:] if NAME_SUFFIX_RE.match(word)]
+            last_words = [word for word in last_words if word not in suffix]
+            return " ".join([first] + last_words + suffix)
+    return name
+
+
+def normalize_unit(part):
+    # "apt. 5" -> "APT 5", "# 12" -> "#12"; None if the piece is not a unit
+    match = UNIT_RE.match(part)
+    if not match:
+        return None
+    designator = match.group("designator").rstrip(".").upper()
+    number = clean(match.group("number"))
+    return f"#{number}" if designator == "#" else f"{designator} {number}"
+
+
+def take_state(piece):
+    # Finds the state at the end of the piece, trying the longest run of words first so
+    # "NEW YORK" wins over "YORK"; returns the state and what is left of the piece
+    words = piece.replace(".", " ").split()
+    for count in range(min(len(words), 4), 0, -1):
+        state = normalize_state(" ".join(words[-count:]))
+        if state:
+            return state, " ".join(words[:-count])
+    return None, piece
+
+
+def parse_address(raw):
+    # Splits "1607 KORNEGAY AVE, APT 5, WILMINGTON, NC. 28405-1234" into Address, City,
+    # State and Zip Code. Never raises: when a part is missing, or the ZIP does not belong
+    # to the state given, the fields that were found are kept and "Raw Address" holds the
+    # original text.
+    text = clean(raw)
+    result = {"Address": "", "City": "", "State": "", "Zip Code": ""}
+    complete = True
+
+    zip_match = ZIP_RE.search(text)
+    if zip_match:
+        # ZIP+4 is kept whole, written the usual way
+        result["Zip Code"] = "-".join(part for part in zip_match.groups() if part)
+        text = text[:zip_match.start()]
+    else:
+        complete = False
+
+    parts = [clean(part) for part in text.split(",")]
+    parts = [part for part in parts if part]
+    state = None
+    if parts:
+        state, parts[-1] = take_state(parts[-1])
+        if not parts[-1]:
+            parts.pop()
+    zip_state = state_for_zip(result["Zip Code"]) if result["Zip Code"] else None
+    if state is None or (zip_state is not None and zip_state != state):
+        complete = False
+    result["State"] = state or zip_state or ""
+
+    if len(parts) >= 2:
+        result["City"] = parts[-1]
+        street = []
+        for part in parts[:-1]:
+            unit = normalize_unit(part)
+            if unit and street:
+                street[-1] += " " + unit
+            else:
+                street.append(part)
+        result["Address"] = ", ".join(street)
+    else:
+        # One piece left: with a house number it is the street, otherwise the city
+        if parts and parts[0][:1].isdigit():
+            result["Address"] = parts[0]
+        elif parts:
+            result["City"] = parts[0]
+        complete = False
+
+    if not complete:
+        result["Raw Address"] = clean(raw)
+    return result
+
@@ -0,0 +1,77 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from .debugstore import save_debug
+from .extract import extract_americanphonebook
+from .metrics import timed
+from .probe import PageProbe, is_ready
+
+
+SEARCH_URL = "https://www.americaphonebook.com/reverse.php"
+
+# The "searchform2" form is only on the page when the search came back empty
+PROBE = PageProbe(results_markers=["Here are your"], no_results_selectors=["form[name=searchform2]", "#searchform2"])
+
+
+class AmericanPhoneBookScraper:
+    name = "americanphonebook"
+    uses_driver = True
+
+    def __init__(self, page_timeout=30, search_url=SEARCH_URL):
+        self.page_timeout = page_timeout
+        self.search_url = search_url
+
+    def scrape_phone_info(self, driver, number, engine=None):
+        try:
+            print(f"Navigating to americaphonebook.com/reverse.php for {number}")
+            wait = WebDriverWait(driver, self.page_timeout)
+            with timed(engine, self.name, number, "navigate"):
+                driver.get(self.search_url)
+                print(f"Waiting for page to be ready for {number}")
+                PROBE.wait_for(wait, is_ready)
+            
+            print(f"Locating search box for {number}")
+            with timed(engine, self.name, number, "locate"):
+                search_box = wait.until(EC.element_to_be_clickable((By.NAME, "number")))
+
+            print(f"Typing {number}")
+            with timed(engine, self.name, number, "type"):
+                driver.execute_script("arguments[0].click();", search_box)
+                search_box.clear()
+                search_box.send_keys(number)
+
+            print(f"Submitting search for {number}")
+            with timed(engine, self.name, number, "submit"):
+                search_box.send_keys(Keys.RETURN)
+
+            # The search page itself may carry the result markers, so wait for it to go away first
+            print(f"Waiting for results for {number}")
+            with timed(engine, self.name, number, "result_wait"):
+                wait.until(EC.staleness_of(search_box))
+                state = PROBE.wait_for(wait, lambda state: is_ready(state) and (state["results"] or state["no_results"]))
+
+            if not state["results"]:
+                print(f"No results found for {number}")
+                save_debug(engine, number, "postwait", lambda: driver.page_source)
+                return {}
+
+            print(f"Scraping data from results page for {number}")
+            with timed(engine, self.name, number, "extract"):
+                page = driver.page_source
+                save_debug(engine, number, "postwait", page)
+                result = extract_americanphonebook(page, number)
+            if result:
+                print(f"Success for {number}: {result['Name']}")
+            else:
+                print(f"No matching result found for {number}")
+            return result
+
+        except Exception as e:
+            print(f"Error scraping {number}: {str(e)}")
+            try:
+                save_debug(engine, number, "error", driver.page_source)
+            except Exception:
+                pass
+            raise
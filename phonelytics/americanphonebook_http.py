@@ -0,0 +1,104 @@
+from urllib.parse import urljoin
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+import requests
+from threading import local
+
+from .americanphonebook import AmericanPhoneBookScraper, SEARCH_URL
+from .debugstore import save_debug
+from .engine import USER_AGENT
+from .extract import extract_americanphonebook
+from .failures import LookupFailed
+from .metrics import timed
+
+
+def parse_search_form(page, base_url):
+    # Returns (method, action, fields) of the form holding the "number" input, hidden fields included
+    doc = lxml_html.fromstring(page)
+    forms = doc.xpath('//form[.//input[@name="number"]]')
+    if not forms:
+        raise LookupFailed("Search form not found")
+    form = forms[0]
+    method = (form.get('method') or 'get').upper()
+    action = urljoin(base_url, form.get('action') or base_url)
+    fields = dict(form.form_values())
+    # form_values() leaves out submit buttons, but a browser sends the one that was used
+    for button in form.xpath('.//input[@type="submit"][@name] | .//button[@name]')[:1]:
+        fields[button.get('name')] = button.get('value', '')
+    return method, action, fields
+
+
+class AmericanPhoneBookHttpScraper:
+    # Submits the reverse.php form over a keep-alive session instead of driving Firefox.
+    # Each worker thread has a session of its own, so one worker's cookies and form token
+    # never end up in another's request. Lookups that fail over HTTP are handed to the
+    # browser scraper, which waits on pacing (the site's RatePolicy) when given one and on
+    # the engine's otherwise.
+    name = AmericanPhoneBookScraper.name
+    uses_driver = False
+
+    def __init__(self, page_timeout=30, fallback=True, pool_size=10, search_url=SEARCH_URL, pacing=None):
+        self.page_timeout = page_timeout
+        self.pacing = pacing
+        self.search_url = search_url
+        self.fallback = AmericanPhoneBookScraper(page_timeout, search_url) if fallback else None
+        self.pool_size = pool_size
+        self.local = local()
+
+    @property
+    def session(self):
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self.local.session = session
+        return session
+
+    def fetch(self, number, engine=None):
+        with timed(engine, self.name, number, "navigate"):
+            response = self.session.get(self.search_url, timeout=self.page_timeout)
+            response.raise_for_status()
+        with timed(engine, self.name, number, "locate"):
+            method, action, fields = parse_search_form(response.text, response.url)
+        fields["number"] = number
+        with timed(engine, self.name, number, "result_wait"):
+            if method == "POST":
+                response = self.session.post(action, data=fields, timeout=self.page_timeout, headers={"Referer": self.search_url})
+            else:
+                response = self.session.get(action, params=fields, timeout=self.page_timeout, headers={"Referer": self.search_url})
+            response.raise_for_status()
+        return response.text
+
+    def scrape_phone_info(self, driver, number, engine=None):
+        page = ""
+        try:
+            print(f"Fetching americaphonebook.com/reverse.php over HTTP for {number}")
+            page = self.fetch(number, engine)
+            save_debug(engine, number, "postwait", page)
+
+            if "Here are your" in page:
+                with timed(engine, self.name, number, "extract"):
+                    result = extract_americanphonebook(page, number)
+                if result:
+                    print(f"Success for {number}: {result['Name']}")
+                else:
+                    print(f"No matching result found for {number}")
+                return result
+            if "searchform2" in page:
+                print(f"No results found for {number}")
+                return {}
+            raise LookupFailed("Unexpected response page")
+
+        except Exception as e:
+            print(f"HTTP lookup failed for {number}: {str(e)}")
+            if page:
+                save_debug(engine, number, "error", page)
+            if self.fallback and engine is not None:
+                print(f"Falling back to the browser for {number}")
+                # The browser lookup is another request to the site, so it waits for a slot of its own
+                engine.paced((self.pacing or engine.pacing).wait())
+                return self.fallback.scrape_phone_info(engine.setup_driver(), number, engine)
+            raise
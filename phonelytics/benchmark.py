@@ -0,0 +1,201 @@
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from threading import Event, Thread
+
+from .americanphonebook import AmericanPhoneBookScraper
+from .americanphonebook_http import AmericanPhoneBookHttpScraper
+from .browser import BrowserProfile
+from .concurrency import ConcurrencyController
+from .connectivity import ConnectivityMonitor
+from .engine import ScrapeEngine
+from .failures import RetryPolicy
+from .pacing import RatePolicy
+from .standin import StandInServer
+from .thatsthem import ThatsthemScraper
+
+# Runs the scrapers against the local stand-in server (see phonelytics.standin) so
+# throughput changes can be measured without a network or the real sites:
+#   python -m phonelytics.benchmark --backends americanphonebook-http --workers 1 2 4
+#   python -m phonelytics.benchmark --backends americanphonebook-browser --profiles lean default
+
+# backend name -> scraper factory taking (server, page_timeout)
+BACKENDS = {
+    "americanphonebook-browser": lambda server, timeout: AmericanPhoneBookScraper(timeout, server.americanphonebook_url),
+    "americanphonebook-http": lambda server, timeout: AmericanPhoneBookHttpScraper(timeout, fallback=False,
+                                                                                   search_url=server.americanphonebook_url),
+    "thatsthem-browser": lambda server, timeout: ThatsthemScraper(timeout, server.thatsthem_url),
+}
+# Browser setups to compare: the lean per-site default and Firefox as it comes
+PROFILES = {
+    "lean": lambda: BrowserProfile(),
+    "default": BrowserProfile.default,
+}
+SAMPLE_INTERVAL = 0.2
+
+
+class TimedScraper:
+    # Wraps a scraper and records how long each scrape_phone_info call took; the
+    # browser start-up is outside of it and only shows in the overall throughput
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.name = scraper.name
+        self.uses_driver = scraper.uses_driver
+        self.latencies = []
+
+    def scrape_phone_info(self, driver, number, engine=None):
+        started = time.monotonic()
+        try:
+            return self.scraper.scrape_phone_info(driver, number, engine)
+        finally:
+            self.latencies.append(time.monotonic() - started)
+
+
+class MemorySampler:
+    # Peak resident memory of this process and its children (geckodriver, Firefox). Needs
+    # psutil; without it no memory figures are reported.
+    def __init__(self):
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+        self.process = psutil.Process() if psutil else None
+        self.peak = 0
+        self.stopped = Event()
+        self.thread = None
+
+    def rss(self):
+        total = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except Exception:
+                pass  # Child exited between listing and reading it
+        return total
+
+    def __enter__(self):
+        if self.process:
+            self.baseline = self.peak = self.rss()
+            self.thread = Thread(target=self.sample, daemon=True)
+            self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join()
+
+    def sample(self):
+        while not self.stopped.wait(SAMPLE_INTERVAL):
+            self.peak = max(self.peak, self.rss())
+
+    def growth(self):
+        return self.peak - self.baseline if self.process else None
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of an unsorted list
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def run_benchmark(backend, workers, count, server, page_timeout=10, verbose=False, max_retries=0, profile="lean",
+                  adaptive=False):
+    scraper = TimedScraper(BACKENDS[backend](server, page_timeout))
+    # Retries back off for a second at first rather than the production 30
+    engine = ScrapeEngine(scraper, headless=True, workers=workers, pacing=RatePolicy(),
+                          monitor=ConnectivityMonitor(None), retry_policy=RetryPolicy(max_retries, retry_delay=1),
+                          browser=PROFILES[profile](),
+                          concurrency=ConcurrencyController(1, workers) if adaptive else ConcurrencyController.fixed(workers))
+    numbers = [f"910{i:07d}" for i in range(count)]
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    bytes_before = server.bytes_sent
+    with MemorySampler() as memory, output:
+        started = time.monotonic()
+        engine.run(numbers)
+        elapsed = time.monotonic() - started
+    growth = memory.growth()
+    transferred = server.bytes_sent - bytes_before
+    return {
+        "backend": backend,
+        "profile": profile if scraper.uses_driver else "-",
+        "workers": workers,
+        "adaptive": adaptive,
+        "peak_workers": engine.concurrency.peak,
+        "lookups": engine.processed,
+        "found": engine.found,
+        "errors": engine.errors,
+        "seconds": round(elapsed, 3),
+        "lookups_per_second": round(engine.processed / elapsed, 3) if elapsed else None,
+        "p50": percentile(scraper.latencies, 0.5),
+        "p95": percentile(scraper.latencies, 0.95),
+        "memory_per_worker_mb": round(growth / workers / 1024 / 1024, 1) if growth is not None else None,
+        "kb_per_lookup": round(transferred / engine.processed / 1024, 1) if engine.processed else None,
+    }
+
+
+def format_row(row):
+    def seconds(value):
+        return f"{value:.3f}s" if value is not None else "-"
+    memory = f"{row['memory_per_worker_mb']:.1f} MB" if row["memory_per_worker_mb"] is not None else "-"
+    transferred = f"{row['kb_per_lookup']:.1f} KB" if row["kb_per_lookup"] is not None else "-"
+    workers = f"{row['peak_workers']}/{row['workers']}" if row["adaptive"] else str(row["workers"])
+    return (f"{row['backend']:<26} {row['profile']:<8} workers={workers:<5} {row['lookups_per_second'] or 0:>8.2f}/s  "
+            f"p50 {seconds(row['p50'])}  p95 {seconds(row['p95'])}  errors {row['errors']:<4} "
+            f"served/lookup {transferred}  mem/worker {memory}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m phonelytics.benchmark",
+                                     description="Benchmark the scrapers against a local stand-in for the lookup sites.")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4], help="concurrency levels to run (default %(default)s)")
+    parser.add_argument("--count", type=int, default=50, help="lookups per run (default %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the stand-in takes per search (default %(default)s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra random seconds per search")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of searches the stand-in fails with a 503")
+    parser.add_argument("--hit-rate", type=float, default=0.5, help="fraction of numbers with a match (default %(default)s)")
+    parser.add_argument("--asset-kb", type=float, default=100,
+                        help="size of each image, font and video the stand-in pages load (default %(default)s)")
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=["lean", "default"],
+                        help="browser setups to compare on the browser backends (default %(default)s)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="let the concurrency controller pick the worker count up to --workers; shows peak/max workers")
+    parser.add_argument("--max-retries", type=int, default=0, help="retries after a failed lookup (default %(default)s)")
+    parser.add_argument("--page-timeout", type=float, default=10, help="seconds a browser waits for a page (default %(default)s)")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="show the scrapers' own output")
+    args = parser.parse_args(argv)
+
+    rows = []
+    with StandInServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, hit_rate=args.hit_rate,
+                       asset_kb=args.asset_kb) as server:
+        print(f"Stand-in server at {server.base_url}")
+        for backend in args.backends:
+            # The browser setup makes no difference to backends that do not use a browser
+            profiles = args.profiles if backend.endswith("-browser") else args.profiles[:1]
+            for profile in profiles:
+                for workers in args.workers:
+                    try:
+                        row = run_benchmark(backend, workers, args.count, server, args.page_timeout, args.verbose,
+                                            args.max_retries, profile, args.adaptive)
+                    except Exception as e:
+                        print(f"{backend:<26} {profile:<8} workers={workers:<3} failed: {str(e).strip()}")
+                        continue
+                    rows.append(row)
+                    print(format_row(row), flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": rows}, f, indent=2)
+        print(f"Results saved to {args.json}")
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import os
+from threading import current_thread
+
+# Firefox prefs that keep a page from fetching what the scrapers never read
+BLOCK_IMAGES_PREFS = {
+    "permissions.default.image": 2,
+}
+BLOCK_FONTS_PREFS = {
+    "browser.display.use_document_fonts": 0,
+    "gfx.downloadable_fonts.enabled": False,
+}
+BLOCK_MEDIA_PREFS = {
+    "media.autoplay.default": 5,
+    "media.autoplay.blocking_policy": 2,
+    "media.preload.default": 0,
+    "media.preload.auto": 0,
+    "media.peerconnection.enabled": False,
+}
+# Network work a browser does ahead of time in case it is needed
+NO_PREFETCH_PREFS = {
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+}
+
+
+class BrowserProfile:
+    # How each worker's Firefox is set up. The lean defaults block images, web fonts and
+    # media and use the "eager" page load strategy, which hands control back once the DOM
+    # is parsed instead of after every subresource has loaded; the page probes wait for
+    # the content they need anyway. With profile_dir set, each worker keeps its own
+    # Firefox profile under it between runs, so caches and cookies are warm at start-up.
+    def __init__(self, block_images=True, block_fonts=True, block_media=True, page_load_strategy="eager", profile_dir=None):
+        self.block_images = block_images
+        self.block_fonts = block_fonts
+        self.block_media = block_media
+        self.page_load_strategy = page_load_strategy
+        self.profile_dir = profile_dir
+
+    @classmethod
+    def from_config(cls, site_config):
+        return cls(site_config.get("block_images", True), site_config.get("block_fonts", True),
+                   site_config.get("block_media", True), site_config.get("page_load_strategy", "eager"),
+                   site_config.get("profile_dir"))
+
+    @classmethod
+    def for_sites(cls, config, sites):
+        # Several sites share one browser in a cascade, so only block what every one of
+        # them can do without and only load eagerly if all of them allow it
+        if isinstance(sites, str):
+            sites = [sites]
+        profiles = [cls.from_config(config.get(site, {})) for site in sites]
+        strategies = {profile.page_load_strategy for profile in profiles}
+        return cls(all(profile.block_images for profile in profiles), all(profile.block_fonts for profile in profiles),
+                   all(profile.block_media for profile in profiles),
+                   strategies.pop() if len(strategies) == 1 else "normal",
+                   next((profile.profile_dir for profile in profiles if profile.profile_dir), None))
+
+    @classmethod
+    def default(cls):
+        # Firefox as it comes, for comparing against
+        return cls(False, False, False, "normal", None)
+
+    def prefs(self):
+        prefs = dict(NO_PREFETCH_PREFS) if self.block_images or self.block_fonts or self.block_media else {}
+        if self.block_images:
+            prefs.update(BLOCK_IMAGES_PREFS)
+        if self.block_fonts:
+            prefs.update(BLOCK_FONTS_PREFS)
+        if self.block_media:
+            prefs.update(BLOCK_MEDIA_PREFS)
+        return prefs
+
+    def worker_profile_dir(self):
+        # Firefox locks a profile while it runs, so every worker thread gets its own
+        path = os.path.join(self.profile_dir, current_thread().name)
+        os.makedirs(path, exist_ok=True)
+        return os.path.abspath(path)
+
+    def apply(self, firefox_options):
+        for name, value in self.prefs().items():
+            firefox_options.set_preference(name, value)
+        firefox_options.page_load_strategy = self.page_load_strategy
+        if self.profile_dir:
+            firefox_options.add_argument("-profile")
+            firefox_options.add_argument(self.worker_profile_dir())
+
+    def describe(self):
+        blocked = [kind for kind, blocked in (("images", self.block_images), ("fonts", self.block_fonts),
+                                              ("media", self.block_media)) if blocked]
+        return f"blocking {', '.join(blocked) or 'nothing'}, {self.page_load_strategy} page loads"
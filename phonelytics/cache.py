@@ -0,0 +1,63 @@
+import json
+import sqlite3
+import time
+from threading import Lock
+
+DEFAULT_CACHE_PATH = "phonelytics_cache.sqlite3"
+DAY = 24 * 60 * 60
+DEFAULT_HIT_TTL = 30 * DAY
+DEFAULT_MISS_TTL = 7 * DAY
+
+
+class LookupCache:
+    # On-disk cache of lookup outcomes keyed by (site, normalized number). Hits store the
+    # result dict, confirmed "no results" outcomes store NULL; each kind has its own TTL.
+    def __init__(self, path=DEFAULT_CACHE_PATH, hit_ttl=DEFAULT_HIT_TTL, miss_ttl=DEFAULT_MISS_TTL):
+        self.path = path
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.lock = Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS lookups (
+                    site TEXT NOT NULL,
+                    number TEXT NOT NULL,
+                    result TEXT,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (site, number)
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS lookups_fetched_at ON lookups (fetched_at)")
+
+    def get(self, site, number):
+        # Returns (cached, result); result is {} for a cached "no results" outcome
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT result, fetched_at FROM lookups WHERE site = ? AND number = ?", (site, number)).fetchone()
+            if row is not None:
+                result, fetched_at = row
+                ttl = self.hit_ttl if result is not None else self.miss_ttl
+                if fetched_at >= time.time() - ttl:
+                    return True, json.loads(result) if result is not None else {}
+            return False, None
+
+    def put(self, site, number, result):
+        # Only store outcomes the site confirmed; None means the lookup failed and is not cached
+        if result is None:
+            return
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO lookups (site, number, result, fetched_at) VALUES (?, ?, ?, ?)",
+                (site, number, json.dumps(result) if result else None, time.time()))
+
+    def prune(self):
+        now = time.time()
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM lookups WHERE fetched_at < CASE WHEN result IS NULL THEN ? ELSE ? END",
+                (now - self.miss_ttl, now - self.hit_ttl))
+        return cursor.rowcount
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,235 @@
+import argparse
+import time
+from threading import Thread
+
+from .browser import BrowserProfile
+from .cache import LookupCache, DEFAULT_CACHE_PATH, DAY
+from .concurrency import ConcurrencyController
+from .config import load_config, DEFAULT_CONFIG_PATH
+from .connectivity import ConnectivityMonitor, DEFAULT_PROBE_URL
+from .debugstore import DebugStore, DEFAULT_DEBUG_DIR, DEFAULT_SUCCESS_RATE, extract_snapshots
+from .engine import ScrapeEngine, MAX_NUMBERS
+from .events import EventBus, format_progress
+from .failures import DeadLetters, RetryPolicy
+from .jobqueue import JobQueue, JobWorker, DEFAULT_CLAIM_SIZE, DEFAULT_LEASE_SECONDS
+from .journal import Journal
+from .loader import load_numbers
+from .metrics import Metrics
+from .pacing import RatePolicy
+from .providers import PROVIDERS, DEFAULT_REQUIRED_FIELDS, create_provider
+from .sinks import open_sink, save_results, DEFAULT_BATCH_SIZE
+from .watchdog import DriverWatchdog
+
+
+REFRESH_INTERVAL = 1.0
+
+
+def render_events(events):
+    # At most one progress line per refresh, however many lookups finished in between
+    progress = [event for event in events if event["type"] == "progress"]
+    for event in events:
+        if event["type"] == "status":
+            print(event["message"], flush=True)
+        elif event is (progress[-1] if progress else None):
+            print(format_progress(event), flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="phonelytics", description="Look up phone numbers without the GUI.")
+    parser.add_argument("input", nargs="?", help="input .txt, .csv or .xlsx file with one phone number per line/row")
+    parser.add_argument("--column", help="name of the phone number column in .csv/.xlsx input, defaults to the first column")
+    parser.add_argument("-o", "--output", help="results file (.xlsx, .csv or .parquet), defaults to phone_search_results_<timestamp>.xlsx")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="results buffered before each write to the output file (default %(default)s)")
+    parser.add_argument("--site", nargs="+", choices=sorted(PROVIDERS), default=["americanphonebook"],
+                        help="site to look numbers up on; with several sites each number goes to the next one only "
+                             "while the result is missing a --require field")
+    parser.add_argument("--require", action="append", metavar="FIELD",
+                        help=f"result field that ends a multi-site cascade once filled, may be repeated (default {', '.join(DEFAULT_REQUIRED_FIELDS)})")
+    parser.add_argument("--backend", choices=["browser", "http"], default="browser",
+                        help="http submits the search form without a browser and only falls back to Firefox when that fails")
+    parser.add_argument("--config", help=f"JSON file with per-site pacing and timeouts, defaults to {DEFAULT_CONFIG_PATH} if present")
+    parser.add_argument("--workers", type=int, help="parallel browser sessions, defaults to the site's 'workers' config setting")
+    parser.add_argument("--min-workers", type=int, help="browser sessions to start with and never go below while the count adapts "
+                                                        "to the site, defaults to the site's 'min_workers' config setting; "
+                                                        "the same as --workers keeps the count fixed")
+    parser.add_argument("--connectivity-url", default=DEFAULT_PROBE_URL,
+                        help="URL probed only after repeated lookup failures, to tell when the connection is back (default %(default)s); pass '' to never probe")
+    parser.add_argument("--profile-dir", help="keep each worker's Firefox profile under this directory between runs; "
+                                              "defaults to the site's 'profile_dir' config setting, or a fresh profile per run")
+    parser.add_argument("--recycle-after", type=int, help="replace each browser after this many lookups, 0 for never; "
+                                                          "defaults to the site's 'recycle_after' config setting")
+    parser.add_argument("--max-rss-mb", type=int, help="replace a browser once it uses more memory than this, 0 for no limit; "
+                                                       "defaults to the site's 'max_rss_mb' config setting")
+    parser.add_argument("--show-browser", action="store_true", help="run Firefox with a visible window instead of headless")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="lookup cache database, defaults to %(default)s")
+    parser.add_argument("--no-cache", action="store_true", help="look every number up on the site even if it is cached")
+    parser.add_argument("--hit-ttl", type=float, default=30, help="days a cached result stays valid (default %(default)s)")
+    parser.add_argument("--miss-ttl", type=float, default=7, help="days a cached 'no results' outcome stays valid (default %(default)s)")
+    parser.add_argument("--journal", help="checkpoint journal, defaults to <input>.<site>.journal.jsonl")
+    parser.add_argument("--resume", action="store_true", help="skip numbers already finished in the journal instead of starting over")
+    parser.add_argument("--max-retries", type=int, help="retries for a number after a transient failure, defaults to the site's 'max_retries' config setting")
+    parser.add_argument("--dead-letters", help="JSON-lines file for numbers that failed for good, defaults to <input>.<site>.failed.jsonl")
+    parser.add_argument("--queue", metavar="PATH",
+                        help="job queue database shared by all workers, e.g. on a shared volume; the input file, if given, "
+                             "is added to it and this process then works through it alongside any other workers")
+    parser.add_argument("--load-only", action="store_true", help="with --queue, only add the input file to the queue")
+    parser.add_argument("--claim", type=int, default=DEFAULT_CLAIM_SIZE, help="numbers a queue worker leases at a time (default %(default)s)")
+    parser.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS,
+                        help="seconds before numbers leased by a worker that stopped answering go back to the queue (default %(default)s)")
+    parser.add_argument("--debug-dir", default=DEFAULT_DEBUG_DIR, help="directory for compressed page snapshots, defaults to %(default)s")
+    parser.add_argument("--debug-sample", type=float, default=DEFAULT_SUCCESS_RATE * 100,
+                        help="percent of successful lookups to keep a page snapshot for (default %(default)s); errors are always kept")
+    parser.add_argument("--metrics-log", help="append a JSON line with the duration of every lookup stage to this file")
+    parser.add_argument("--metrics-textfile", help="write stage latency histograms and outcome counters in Prometheus text format "
+                                                   "to this file, e.g. in node_exporter's textfile collector directory")
+    parser.add_argument("--extract-debug", metavar="NUMBER", help="write the stored page snapshots for NUMBER to the current directory and exit")
+    parser.add_argument("--prune-cache", action="store_true", help="delete expired cache entries and exit")
+    args = parser.parse_args(argv)
+
+    if args.extract_debug:
+        paths = extract_snapshots(args.extract_debug, directory=args.debug_dir)
+        for path in paths:
+            print(path)
+        if not paths:
+            print(f"No snapshots stored for {args.extract_debug}")
+        return 0
+
+    cache = None
+    if not args.no_cache or args.prune_cache:
+        cache = LookupCache(args.cache, hit_ttl=args.hit_ttl * DAY, miss_ttl=args.miss_ttl * DAY)
+
+    if args.prune_cache:
+        print(f"Removed {cache.prune()} expired cache entries from {args.cache}")
+        return 0
+
+    if not args.input and not args.queue:
+        parser.error("the input file is required")
+    try:
+        config = load_config(args.config)
+    except Exception as e:
+        print(f"Failed to load config: {str(e)}")
+        return 1
+    try:
+        scraper = create_provider(args.site, args.backend, config, tuple(args.require or DEFAULT_REQUIRED_FIELDS))
+    except ValueError as e:
+        parser.error(str(e))
+    # A cascade has no settings of its own; each site in it is paced by its own
+    site_config = config.get(scraper.name, {})
+
+    job = None
+    if args.queue:
+        job = JobQueue(args.queue, lease_seconds=args.lease)
+        if args.input:
+            try:
+                added, number_filter = job.load_file(args.input, args.column)
+            except Exception as e:
+                print(f"Failed to load file: {str(e)}")
+                return 1
+            print(number_filter.summary())
+            print(f"Added {added} numbers to {args.queue} ({job.summary()})")
+        if args.load_only:
+            job.close()
+            return 0
+    else:
+        try:
+            numbers, number_filter = load_numbers(args.input, args.column)
+        except Exception as e:
+            print(f"Failed to load file: {str(e)}")
+            return 1
+
+        print(number_filter.summary())
+        if not numbers:
+            print("No valid phone numbers detected!")
+            return 1
+
+        if len(numbers) > MAX_NUMBERS:
+            print("Maximum 100,000 numbers allowed! Use --queue for larger lists")
+            return 1
+
+    output = args.output or f"phone_search_results_{time.strftime('%Y%m%d_%H%M%S')}.xlsx"
+    sink = None
+    journal = None
+    if job is None:
+        try:
+            sink = open_sink(output, args.batch_size)
+        except Exception as e:
+            print(f"Failed to open output file: {str(e)}")
+            return 1
+        journal = Journal(args.journal or f"{args.input}.{scraper.name}.journal.jsonl", resume=args.resume)
+        if journal.done:
+            print(f"Resuming from {journal.path}: {len(journal.done)} numbers already done")
+    debug_store = DebugStore(args.debug_dir, success_rate=args.debug_sample / 100)
+    dead_letters = DeadLetters(args.dead_letters or f"{args.input or args.queue}.{scraper.name}.failed.jsonl")
+    retry_policy = RetryPolicy.from_config(site_config)
+    if args.max_retries is not None:
+        retry_policy.max_retries = args.max_retries
+    metrics = Metrics(args.metrics_log, args.metrics_textfile)
+    workers = args.workers or site_config.get("workers", 1)
+    concurrency = ConcurrencyController.from_config(site_config, workers)
+    if args.min_workers is not None:
+        concurrency = ConcurrencyController(args.min_workers, workers, concurrency.window, concurrency.max_error_rate,
+                                            concurrency.target_latency)
+    browser = BrowserProfile.for_sites(config, args.site)
+    if args.profile_dir:
+        browser.profile_dir = args.profile_dir
+    watchdog = DriverWatchdog.from_config(site_config)
+    if args.recycle_after is not None:
+        watchdog.recycle_after = args.recycle_after
+    if args.max_rss_mb is not None:
+        watchdog.max_rss_mb = args.max_rss_mb
+    events = EventBus()
+    engine = ScrapeEngine(scraper, headless=not args.show_browser, workers=workers, pacing=RatePolicy.from_config(site_config),
+                          monitor=ConnectivityMonitor(args.connectivity_url or None), cache=cache, journal=journal,
+                          sink=sink, debug_store=debug_store, events=events, metrics=metrics,
+                          retry_policy=retry_policy, dead_letters=dead_letters, browser=browser,
+                          watchdog=watchdog, concurrency=concurrency)
+    # In queue mode every result goes straight back to the queue and nothing is kept in memory
+    runner = JobWorker(engine, job, args.claim) if job is not None else None
+    errors = []
+
+    def run():
+        try:
+            if runner is not None:
+                runner.run()
+            else:
+                engine.run(numbers)
+        except Exception as e:
+            errors.append(e)
+
+    thread = Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(REFRESH_INTERVAL)
+            render_events(events.drain())
+    except KeyboardInterrupt:
+        if runner is not None:
+            print("Interrupted - handing unfinished numbers back to the queue")
+            runner.stop()
+        else:
+            print("Interrupted - saving results collected so far, rerun with --resume to continue")
+            engine.stop()
+        thread.join()
+    render_events(events.drain())
+    if errors:
+        print(f"Scraping failed: {str(errors[0])}")
+    debug_store.close()
+    metrics.close()
+    dead_letters.close()
+    print(metrics.summary())
+    if dead_letters.count:
+        print(f"{dead_letters.count} numbers failed for good, see {dead_letters.path}")
+    if job is not None:
+        print(runner.summary())
+        # Any worker can export; numbers still leased elsewhere are simply not in the file yet
+        if args.output:
+            save_results(job.results(), output)
+            print(f"Results saved to {output}")
+        job.close()
+        return 1 if errors or engine.errors else 0
+    journal.close()
+    sink.close()
+    print(engine.summary())
+    print(f"Results saved to {output}")
+    # Numbers that failed for good count as a failed run too, so scripts can tell
+    return 1 if errors or engine.errors else 0
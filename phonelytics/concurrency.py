@@ -0,0 +1,88 @@
+from threading import Lock
+
+DEFAULT_MIN_WORKERS = 1
+DEFAULT_ADAPT_WINDOW = 10
+DEFAULT_MAX_ERROR_RATE = 0.2
+# A window whose median latency is this many times the best median seen so far counts
+# as the site slowing down
+SLOWDOWN_FACTOR = 2.0
+DECREASE_FACTOR = 0.5
+
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+class ConcurrencyController:
+    # Decides how many of the engine's workers may run lookups at once, between
+    # min_workers and max_workers, AIMD style: after every window lookups, one more worker
+    # is let in if the window went well, and the count is halved if more than
+    # max_error_rate of its lookups failed transiently (timeouts, WebDriver and network
+    # errors) or its median latency rose past target_latency seconds, or past twice the
+    # best median seen when no target is set. Starts at min_workers. The hard ceiling on
+    # the request rate stays with the site's RatePolicy, whatever the worker count.
+    def __init__(self, min_workers=DEFAULT_MIN_WORKERS, max_workers=1, window=DEFAULT_ADAPT_WINDOW,
+                 max_error_rate=DEFAULT_MAX_ERROR_RATE, target_latency=None):
+        self.min_workers = max(1, min(min_workers, max_workers))
+        self.max_workers = max(1, max_workers)
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.target_latency = target_latency
+        self.limit = self.min_workers
+        self.peak = self.limit
+        self.increases = 0
+        self.decreases = 0
+        self.best_latency = None
+        self.outcomes = []
+        self.lock = Lock()
+
+    @classmethod
+    def from_config(cls, site_config, max_workers=None):
+        max_workers = max_workers if max_workers is not None else site_config.get("workers", 1)
+        return cls(site_config.get("min_workers", DEFAULT_MIN_WORKERS), max_workers,
+                   site_config.get("adapt_window", DEFAULT_ADAPT_WINDOW),
+                   site_config.get("max_error_rate", DEFAULT_MAX_ERROR_RATE), site_config.get("target_latency"))
+
+    @classmethod
+    def fixed(cls, workers):
+        return cls(workers, workers)
+
+    def record(self, latency, failed):
+        # One finished lookup: how long scrape_phone_info took and whether it failed transiently
+        with self.lock:
+            self.outcomes.append((latency, failed))
+            if len(self.outcomes) < self.window:
+                return
+            error_rate = sum(1 for latency, failed in self.outcomes if failed) / len(self.outcomes)
+            # Failed lookups often end in a timeout, so only successful ones say how fast the site is
+            latencies = [latency for latency, failed in self.outcomes if not failed]
+            self.outcomes = []
+            typical = median(latencies) if latencies else None
+            if typical is not None and (self.best_latency is None or typical < self.best_latency):
+                self.best_latency = typical
+            slow = typical is not None and typical > (self.target_latency or self.best_latency * SLOWDOWN_FACTOR)
+            previous = self.limit
+            if error_rate > self.max_error_rate or slow:
+                self.limit = max(self.min_workers, int(self.limit * DECREASE_FACTOR))
+                if self.limit < previous:
+                    self.decreases += 1
+                    reason = f"{error_rate:.0%} errors" if not slow else f"median lookup {typical:.1f}s"
+                    print(f"Lowering concurrency from {previous} to {self.limit} workers ({reason})")
+            elif self.limit < self.max_workers:
+                self.limit += 1
+                self.increases += 1
+                self.peak = max(self.peak, self.limit)
+                print(f"Raising concurrency from {previous} to {self.limit} workers")
+
+    def allows(self, slot):
+        # slot is the worker's number, counted from 0
+        return slot < self.limit
+
+    def summary(self):
+        with self.lock:
+            if self.min_workers == self.max_workers:
+                return ""
+            return (f"Workers: {self.limit} of {self.min_workers}-{self.max_workers} (peak {self.peak}, "
+                    f"{self.increases} up, {self.decreases} down)")
@@ -0,0 +1,75 @@
+import copy
+import json
+import os
+
+DEFAULT_CONFIG_PATH = "phonelytics.json"
+
+# Per-site settings. Pacing caps how often a lookup is started against the site, shared
+# by all workers; workers is the number of parallel browser sessions; page_timeout is the
+# longest any single page wait may take. Transient failures are retried up to max_retries
+# times, retry_delay seconds apart at first and doubling up to max_retry_delay. The
+# browser settings are described in phonelytics.browser.BrowserProfile; thatsthem keeps
+# images so its verification challenges stay solvable. A worker's browser is replaced
+# after recycle_after lookups or once it uses more than max_rss_mb; 0 turns either off.
+# With workers above min_workers, the number of active workers adapts between the two
+# (see phonelytics.concurrency): every adapt_window lookups it goes up by one, or is
+# halved when more than max_error_rate of them failed or lookups got slow (past
+# target_latency seconds if set).
+DEFAULT_CONFIG = {
+    "americanphonebook": {
+        "requests_per_minute": 10,
+        "min_interval": 2.0,
+        "jitter": 2.0,
+        "page_timeout": 30,
+        "workers": 1,
+        "max_retries": 3,
+        "retry_delay": 30,
+        "max_retry_delay": 600,
+        "block_images": True,
+        "block_fonts": True,
+        "block_media": True,
+        "page_load_strategy": "eager",
+        "profile_dir": None,
+        "recycle_after": 500,
+        "max_rss_mb": 1500,
+        "min_workers": 1,
+        "adapt_window": 10,
+        "max_error_rate": 0.2,
+        "target_latency": None,
+    },
+    "thatsthem": {
+        "requests_per_minute": 10,
+        "min_interval": 2.0,
+        "jitter": 2.0,
+        "page_timeout": 30,
+        "workers": 1,
+        "max_retries": 3,
+        "retry_delay": 30,
+        "max_retry_delay": 600,
+        "block_images": False,
+        "block_fonts": True,
+        "block_media": True,
+        "page_load_strategy": "eager",
+        "profile_dir": None,
+        "recycle_after": 500,
+        "max_rss_mb": 1500,
+        "min_workers": 1,
+        "adapt_window": 10,
+        "max_error_rate": 0.2,
+        "target_latency": None,
+    },
+}
+
+
+def load_config(path=None):
+    # Defaults overlaid with the JSON file at path (or phonelytics.json if it exists),
+    # e.g. {"thatsthem": {"requests_per_minute": 4}}
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if path is None and os.path.exists(DEFAULT_CONFIG_PATH):
+        path = DEFAULT_CONFIG_PATH
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+        for site, settings in overrides.items():
+            config.setdefault(site, {}).update(settings)
+    return config
@@ -0,0 +1,70 @@
+import time
+from threading import Event, Lock, Thread
+import requests
+
+DEFAULT_PROBE_URL = "https://www.google.com"
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_PROBE_INTERVAL = 5
+
+
+class ConnectivityMonitor:
+    # Cached online/offline state fed by the outcome of real lookups, so nothing extra is
+    # sent while lookups succeed. After failure_threshold failures in a row the state flips
+    # to offline and a background thread probes probe_url every probe_interval seconds
+    # until it answers. Workers block on the `online` event in the meantime. With no
+    # probe_url the monitor just goes back online after one probe_interval.
+    def __init__(self, probe_url=DEFAULT_PROBE_URL, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 probe_interval=DEFAULT_PROBE_INTERVAL):
+        self.probe_url = probe_url
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.online = Event()
+        self.online.set()
+        self.failures = 0
+        self.outages = 0
+        self.lock = Lock()
+        self.session = requests.Session()
+
+    @property
+    def is_online(self):
+        return self.online.is_set()
+
+    def report_success(self):
+        with self.lock:
+            self.failures = 0
+
+    def report_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures < self.failure_threshold or not self.online.is_set():
+                return
+            self.online.clear()
+            self.outages += 1
+        print("Connection looks down, pausing lookups until it is back")
+        Thread(target=self.probe_until_online, daemon=True).start()
+
+    def check(self):
+        if not self.probe_url:
+            return True
+        try:
+            self.session.head(self.probe_url, timeout=5)
+            return True
+        except requests.RequestException:
+            return False
+
+    def probe_until_online(self):
+        while True:
+            time.sleep(self.probe_interval)
+            if self.check():
+                break
+        with self.lock:
+            self.failures = 0
+            self.online.set()
+        print("Connection is back, resuming lookups")
+
+    def wait_online(self, should_continue):
+        # Blocks while offline; returns False if should_continue() turns false first
+        while not self.online.wait(1):
+            if not should_continue():
+                return False
+        return True
@@ -0,0 +1,138 @@
+import glob
+import os
+import queue
+import random
+import time
+import zipfile
+from threading import Thread
+
+DEFAULT_DEBUG_DIR = "debug"
+DEFAULT_SUCCESS_RATE = 0.01
+DEFAULT_MAX_ARCHIVE_BYTES = 50 * 1024 * 1024
+DEFAULT_MAX_ARCHIVES = 20
+QUEUE_SIZE = 1000
+
+
+class DebugStore:
+    # Keeps page snapshots for troubleshooting without a file per lookup. Error snapshots
+    # are always kept, other snapshots are sampled at success_rate. A background thread
+    # deflates them into zip archives that roll over at max_archive_bytes; only the newest
+    # max_archives archives are kept.
+    def __init__(self, directory=DEFAULT_DEBUG_DIR, success_rate=DEFAULT_SUCCESS_RATE,
+                 max_archive_bytes=DEFAULT_MAX_ARCHIVE_BYTES, max_archives=DEFAULT_MAX_ARCHIVES):
+        self.directory = directory
+        self.success_rate = success_rate
+        self.max_archive_bytes = max_archive_bytes
+        self.max_archives = max_archives
+        self.archive = None
+        self.archive_path = None
+        self.archive_bytes = 0
+        self.sequence = 0
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.writer = Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    def save(self, number, kind, page):
+        # page may be a callable so the HTML is only fetched for snapshots that are kept
+        if kind != "error" and random.random() >= self.success_rate:
+            return
+        if callable(page):
+            page = page()
+        try:
+            self.queue.put_nowait((number, kind, time.time(), page))
+        except queue.Full:
+            # Never block a lookup on debug output
+            self.dropped += 1
+
+    def flush(self):
+        self.queue.join()
+
+    def close(self):
+        self.queue.put((None, None, None, None))
+        self.writer.join()
+
+    def write_loop(self):
+        while True:
+            number, kind, saved_at, page = self.queue.get()
+            try:
+                if number is None:
+                    self.close_archive()
+                    return
+                self.write_snapshot(number, kind, saved_at, page)
+                # Close the archive whenever the queue runs dry so it is always readable on disk
+                if self.queue.empty():
+                    self.close_archive()
+            except Exception as e:
+                print(f"Failed to write debug snapshot for {number}: {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    def write_snapshot(self, number, kind, saved_at, page):
+        if self.archive is None:
+            self.open_archive()
+        name = f"{number}_{kind}_{int(saved_at * 1000)}.html"
+        self.archive.writestr(name, page.encode("utf-8"), compress_type=zipfile.ZIP_DEFLATED)
+        self.archive_bytes += self.archive.getinfo(name).compress_size
+        if self.archive_bytes >= self.max_archive_bytes:
+            self.close_archive()
+            self.archive_path = None
+
+    def open_archive(self):
+        if self.archive_path is None:
+            self.sequence += 1
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            self.archive_path = os.path.join(self.directory, f"debug_{stamp}_{os.getpid()}_{self.sequence:04d}.zip")
+            self.archive_bytes = 0
+            self.prune_archives()
+        self.archive = zipfile.ZipFile(self.archive_path, "a", compression=zipfile.ZIP_DEFLATED)
+
+    def close_archive(self):
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+
+    def prune_archives(self):
+        archives = sorted(list_archives(self.directory), key=os.path.getmtime)
+        for path in archives[:max(0, len(archives) - self.max_archives + 1)]:
+            os.remove(path)
+
+
+def save_debug(engine, number, kind, page):
+    if engine is not None and engine.debug_store is not None:
+        engine.debug_store.save(number, kind, page)
+
+
+def list_archives(directory=DEFAULT_DEBUG_DIR):
+    return glob.glob(os.path.join(directory, "debug_*.zip"))
+
+
+def list_snapshots(number=None, directory=DEFAULT_DEBUG_DIR):
+    # Returns (archive path, entry name) pairs, oldest archive first
+    snapshots = []
+    for archive_path in sorted(list_archives(directory), key=os.path.getmtime):
+        try:
+            with zipfile.ZipFile(archive_path) as archive:
+                for name in archive.namelist():
+                    if number is None or name.startswith(f"{number}_"):
+                        snapshots.append((archive_path, name))
+        except zipfile.BadZipFile:
+            # Archive is still being written by a running job
+            continue
+    return snapshots
+
+
+def read_snapshot(archive_path, name):
+    with zipfile.ZipFile(archive_path) as archive:
+        return archive.read(name).decode("utf-8")
+
+
+def extract_snapshots(number, dest=".", directory=DEFAULT_DEBUG_DIR):
+    paths = []
+    for archive_path, name in list_snapshots(number, directory):
+        path = os.path.join(dest, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(read_snapshot(archive_path, name))
+        paths.append(path)
+    return paths
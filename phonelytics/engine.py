@@ -0,0 +1,473 @@
+from selenium import webdriver
+from selenium.webdriver.firefox.options import Options
+import heapq
+import re
+import queue
+import time
+from threading import Lock, Thread, local
+
+from .browser import BrowserProfile
+from .concurrency import ConcurrencyController
+from .config import load_config
+from .connectivity import ConnectivityMonitor
+from .events import PROGRESS_INTERVAL
+from .failures import RetryPolicy, LookupFailed, TRANSIENT, classify_error, is_session_dead
+from .metrics import timed
+from .pacing import RatePolicy
+from .records import result_store
+from .watchdog import DriverWatchdog, driver_pid, kill_process_tree
+
+MAX_NUMBERS = 100000
+# How often an idle worker looks again while other workers may still schedule retries
+RETRY_POLL = 0.5
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/115.0"
+
+
+def format_phone_number(number):
+    cleaned = re.sub(r'[^\d+]', '', str(number).strip())
+    if len(cleaned) == 10 and cleaned.isdigit():
+        return cleaned
+    if cleaned.startswith('+1') and len(cleaned) == 12:
+        return cleaned[2:]
+    elif cleaned.startswith('1') and len(cleaned) == 11:
+        return cleaned[1:]
+    return None
+
+
+def setup_driver(headless=False, profile=None):
+    print("Initializing Firefox driver...")
+    firefox_options = Options()
+    firefox_options.add_argument("--disable-blink-features=AutomationControlled")
+    firefox_options.add_argument(f"user-agent={USER_AGENT}")
+    firefox_options.add_argument("--disable-extensions")
+    if headless:
+        firefox_options.add_argument("-headless")
+    if profile is not None:
+        profile.apply(firefox_options)
+    try:
+        driver = webdriver.Firefox(options=firefox_options)
+        driver.set_window_size(1200, 800)
+        if not headless:
+            driver.set_window_position(100, 100)
+        print("Driver initialized successfully.")
+        return driver
+    except Exception as e:
+        print(f"Failed to initialize driver: {str(e)}")
+        raise
+
+
+class ScrapeEngine:
+    # Runs a scraper over a list of numbers without any GUI. Numbers are pulled from a
+    # shared queue by up to `workers` threads, each with its own WebDriver session; the
+    # concurrency controller decides how many of them are active (see
+    # phonelytics.concurrency) while the pacing policy caps the combined request rate.
+    # Front ends follow the job through the events published to `events` (see
+    # phonelytics.events); only an interactive front end can clear human verification
+    # pages.
+    # scrape_phone_info returns a result dict or {} when the site confirmed there is no
+    # match, and raises when the lookup failed. Transient failures are retried with the
+    # backoff of retry_policy; numbers that fail for good go to dead_letters and count
+    # as errors. A dead browser session is replaced before the next lookup, and the
+    # watchdog replaces browsers that are worn out (see phonelytics.watchdog). With a sink
+    # attached, results are streamed to it instead of being collected in self.results
+    # (a phonelytics.records.ResultTable when pyarrow is installed). A feed passed to run
+    # keeps the workers and their browsers going past the numbers given: whenever the
+    # queue runs dry it is asked for more, and the job ends once it returns None.
+    def __init__(self, scraper, headless=False, workers=1, pacing=None, monitor=None, cache=None, journal=None, sink=None,
+                 debug_store=None, events=None, interactive=False, metrics=None, retry_policy=None, dead_letters=None, browser=None,
+                 watchdog=None, concurrency=None):
+        self.scraper = scraper
+        self.pacing = pacing if pacing is not None else RatePolicy.from_config(load_config().get(scraper.name, {}))
+        self.monitor = monitor if monitor is not None else ConnectivityMonitor()
+        self.headless = headless
+        self.workers = workers
+        self.cache = cache
+        self.journal = journal
+        self.sink = sink
+        self.debug_store = debug_store
+        self.events = events
+        self.interactive = interactive
+        self.metrics = metrics
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy.from_config(load_config().get(scraper.name, {}))
+        self.dead_letters = dead_letters
+        self.browser = browser if browser is not None else BrowserProfile.from_config(load_config().get(scraper.name, {}))
+        self.watchdog = watchdog if watchdog is not None else DriverWatchdog.from_config(load_config().get(scraper.name, {}))
+        self.concurrency = (concurrency if concurrency is not None
+                            else ConcurrencyController.from_config(load_config().get(scraper.name, {}), self.workers))
+        self.results = result_store()
+        self.found = 0
+        self.processed = 0
+        self.resumed = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.retried = 0
+        self.driver_restarts = 0
+        self.retries = []
+        self.feed = None
+        self.feed_lock = Lock()
+        self.is_scraping = False
+        self.is_paused = False
+        self.lock = Lock()
+        self.local = local()
+        self.error = None
+
+    def setup_driver(self):
+        # One driver per worker thread. Providers that start it themselves during a lookup
+        # (the http backend's browser fallback) get the same handling of a failed start.
+        driver = getattr(self.local, "driver", None)
+        if not driver:
+            try:
+                with timed(self, self.scraper.name, None, "driver_start"):
+                    driver = setup_driver(self.headless, self.browser)
+            except Exception as e:
+                # A browser that will not start is retried like any other transient failure
+                raise LookupFailed(f"Browser failed to start: {str(e).strip()}") from e
+            self.local.driver = driver
+            self.watchdog.started(self.local, driver)
+        return driver
+
+    def check_driver(self, number):
+        # After each lookup: close tabs it left open and replace a browser that is worn out.
+        # Goes by the worker's browser, whoever started it.
+        driver = getattr(self.local, "driver", None)
+        if not driver:
+            return
+        try:
+            reason = self.watchdog.check(self.local, driver)
+        except Exception as e:
+            reason = f"it did not respond ({type(e).__name__})"
+        if reason:
+            print(f"Recycling the browser after {number}: {reason}")
+            self.quit_driver()
+
+    def quit_driver(self):
+        driver = getattr(self.local, "driver", None)
+        try:
+            if driver:
+                driver.quit()
+        except:
+            # A browser that cannot be asked to quit is killed, so it does not linger
+            kill_process_tree(driver_pid(driver))
+        self.local.driver = None
+
+    def publish(self, type, **fields):
+        if self.events is not None:
+            self.events.publish(type, **fields)
+
+    def report_status(self, text):
+        self.publish("status", message=text)
+
+    def stop(self):
+        self.is_scraping = False
+
+    def resume(self):
+        self.is_paused = False
+
+    def wait_for_verification(self, number):
+        # Returns True once the user has cleared the verification page, False if the job was stopped
+        if not self.interactive:
+            print(f"Human verification required for {number} but no front end is attached to complete it")
+            return False
+        self.is_paused = True
+        self.report_status("Paused: Waiting for human verification")
+        self.publish("verification", number=number)
+        while self.is_paused and self.is_scraping:
+            time.sleep(1)
+        return self.is_scraping
+
+    def wait_for_connection(self):
+        if self.monitor.is_online:
+            return self.is_scraping
+        self.is_paused = True
+        self.report_status("Paused: No internet connection. Waiting to reconnect...")
+        online = self.monitor.wait_online(lambda: self.is_scraping)
+        self.is_paused = False
+        return online and self.is_scraping
+
+    def lookup(self, number, attempt=0):
+        # Returns (result, cached, error). The driver is only started once a number misses
+        # the cache, and a failed start is an error of the lookup; result and error are both
+        # None if the job stopped before the lookup. Hits and misses are counted once per
+        # number, on its first attempt.
+        if self.cache is not None:
+            cached, result = self.cache.get(self.scraper.name, number)
+            if attempt == 0:
+                with self.lock:
+                    if cached:
+                        self.cache_hits += 1
+                    else:
+                        self.cache_misses += 1
+            if cached:
+                return result, True, None
+        if not self.wait_for_connection():
+            return None, False, None
+        driver = None
+        started = None
+        try:
+            if self.scraper.uses_driver:
+                driver = self.setup_driver()
+            self.pacing.wait()
+            self.local.paced = 0.0
+            started = time.monotonic()
+            result = self.scraper.scrape_phone_info(driver, number, self)
+            if result is None:
+                raise LookupFailed(f"{self.scraper.name} returned no outcome")
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.record_outcome(self.scraper.name, None, e)
+            # Only transient failures can mean the connection is down or the site is overloaded
+            transient = classify_error(e) == TRANSIENT
+            # A fatal failure says nothing about how the site copes with the load
+            if started is not None and transient:
+                self.concurrency.record(self.latency_since(started), True)
+            if transient:
+                self.monitor.report_failure()
+            # Also covers a browser a provider started itself, e.g. the http backend's fallback
+            if not is_session_dead(e):
+                self.check_driver(number)
+            return None, False, e
+        self.concurrency.record(self.latency_since(started), False)
+        self.check_driver(number)
+        if self.metrics is not None:
+            self.metrics.record_outcome(self.scraper.name, result)
+        self.monitor.report_success()
+        if self.cache is not None:
+            self.cache.put(self.scraper.name, number, result)
+        return result, False, None
+
+    def paced(self, delay):
+        # Providers that wait on pacing of their own during a lookup (a cascade) report
+        # it here, so the concurrency controller does not take the rate cap for a slow site
+        self.local.paced = getattr(self.local, "paced", 0.0) + delay
+
+    def latency_since(self, started):
+        return max(0.0, time.monotonic() - started - getattr(self.local, "paced", 0.0))
+
+    def handle_failure(self, index, number, attempt, error):
+        # Returns True if the number was scheduled for another try
+        outcome = classify_error(error)
+        if is_session_dead(error):
+            print(f"Browser session died while looking up {number}, starting a new one")
+            self.quit_driver()
+            with self.lock:
+                self.driver_restarts += 1
+        if outcome == TRANSIENT and attempt < self.retry_policy.max_retries:
+            delay = self.retry_policy.delay(attempt + 1)
+            print(f"Retrying {number} in {delay:.0f}s after {type(error).__name__}")
+            with self.lock:
+                heapq.heappush(self.retries, (time.monotonic() + delay, index, number, attempt + 1))
+                self.retried += 1
+            return True
+        print(f"Giving up on {number} ({outcome}) after {attempt + 1} attempts: {type(error).__name__}")
+        if self.dead_letters is not None:
+            self.dead_letters.record(number, outcome, error, attempt + 1)
+        return False
+
+    def summary(self):
+        text = f"Processed: {self.processed} | Found: {self.found} | Errors: {self.errors}"
+        if self.resumed:
+            text += f" | Resumed: {self.resumed}"
+        if self.retried:
+            text += f" | Retries: {self.retried}"
+        if self.driver_restarts:
+            text += f" | Browser restarts: {self.driver_restarts}"
+        concurrency_summary = self.concurrency.summary()
+        if concurrency_summary:
+            text += f" | {concurrency_summary}"
+        watchdog_summary = self.watchdog.summary()
+        if watchdog_summary:
+            text += f" | {watchdog_summary}"
+        if self.cache is not None:
+            text += f" | Cache hits: {self.cache_hits} | Cache misses: {self.cache_misses}"
+        # Providers that combine several sources report how each of them did
+        provider_summary = getattr(self.scraper, "summary", None)
+        if provider_summary is not None:
+            text += f" | {provider_summary()}"
+        return text
+
+    def add_result(self, result):
+        self.found += 1
+        if self.sink is not None:
+            self.sink.write(result)
+        else:
+            self.results.append(result)
+
+    def finish(self, index, result, resumed=False):
+        # Results are released to the sink in input order, whatever order workers finish in
+        with self.lock:
+            self.processed += 1
+            if resumed:
+                self.resumed += 1
+            elif result is None:
+                self.errors += 1
+            self.pending[index] = result
+            while self.next_index in self.pending:
+                result = self.pending.pop(self.next_index)
+                self.next_index += 1
+                if result:
+                    self.add_result(result)
+            self.publish_progress()
+
+    def publish_progress(self, force=False):
+        # Throttled so fast backends or many workers cannot flood the front end
+        now = time.monotonic()
+        if not force and self.processed < self.total_numbers and now - self.last_progress < PROGRESS_INTERVAL:
+            return
+        self.last_progress = now
+        looked_up = self.processed - self.resumed
+        rate = looked_up / (now - self.started) if now > self.started else 0.0
+        eta = (self.total_numbers - self.processed) / rate if rate else None
+        self.publish("progress", processed=self.processed, total=self.total_numbers, found=self.found,
+                     errors=self.errors, rate=rate, eta=eta)
+
+    def is_done(self):
+        # Called with self.lock held
+        return self.processed >= self.total_numbers and self.feed is None
+
+    def refill(self):
+        # Asks the feed for more numbers; True if it gave some. One worker asks at a time,
+        # the others go on with retries in the meantime.
+        if self.feed is None or not self.feed_lock.acquire(blocking=False):
+            return False
+        try:
+            numbers = self.feed()
+            if numbers is None:
+                self.feed = None
+                return False
+            with self.lock:
+                for number in numbers:
+                    self.queue.put((self.total_numbers, number))
+                    self.total_numbers += 1
+            return bool(numbers)
+        finally:
+            self.feed_lock.release()
+
+    def next_item(self):
+        # Due retries come first, then new numbers. Returns (index, number, attempt), or
+        # None once every number is finished or the job was stopped.
+        while self.is_scraping:
+            with self.lock:
+                if self.retries and self.retries[0][0] <= time.monotonic():
+                    return heapq.heappop(self.retries)[1:]
+            try:
+                index, number = self.queue.get_nowait()
+                return index, number, 0
+            except queue.Empty:
+                pass
+            if self.refill():
+                continue
+            # Lookups still running on other workers may yet schedule a retry
+            with self.lock:
+                if self.is_done():
+                    return None
+                delay = self.retries[0][0] - time.monotonic() if self.retries else RETRY_POLL
+            time.sleep(min(max(delay, 0.01), RETRY_POLL))
+        return None
+
+    def wait_for_slot(self, slot):
+        # Workers above the concurrency controller's current limit sit out until it rises
+        # again; returns False once the job is over
+        while self.is_scraping and not self.concurrency.allows(slot):
+            with self.lock:
+                if self.is_done():
+                    return False
+            time.sleep(RETRY_POLL)
+        return self.is_scraping
+
+    def work(self, slot=0):
+        try:
+            while self.is_scraping:
+                if not self.wait_for_slot(slot):
+                    return
+                item = self.next_item()
+                if item is None:
+                    return
+                index, number, attempt = item
+
+                # With a journal, numbers finished by an earlier run are skipped
+                if self.journal is not None and number in self.journal.done:
+                    self.finish(index, None, resumed=True)
+                    continue
+
+                result, cached, error = self.lookup(number, attempt)
+                if result is None and error is None:
+                    return
+                if error is not None and self.handle_failure(index, number, attempt, error):
+                    continue
+                if self.journal is not None:
+                    self.journal.record(number, result)
+                self.finish(index, result)
+        except Exception as e:
+            print(f"Worker stopped on error: {str(e)}")
+            with self.lock:
+                if self.error is None:
+                    self.error = e
+            self.stop()
+        finally:
+            self.quit_driver()
+
+    def run(self, numbers, feed=None):
+        self.results = result_store()
+        self.found = 0
+        # Results of numbers finished by an earlier run come first
+        if self.journal is not None:
+            for result in self.journal.results():
+                self.add_result(result)
+        self.processed = 0
+        self.resumed = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.retried = 0
+        self.driver_restarts = 0
+        self.watchdog.start_job()
+        self.retries = []
+        self.started = time.monotonic()
+        self.last_progress = 0.0
+        self.pending = {}
+        self.next_index = 0
+        self.error = None
+        self.is_scraping = True
+        self.is_paused = False
+        self.total_numbers = len(numbers)
+        self.feed = feed
+        self.queue = queue.Queue()
+        for item in enumerate(numbers):
+            self.queue.put(item)
+
+        thread_count = self.workers if feed is not None else min(self.workers, self.total_numbers)
+        threads = [Thread(target=self.work, args=(i,), name=f"phonelytics-worker-{i + 1}", daemon=True)
+                   for i in range(max(1, thread_count))]
+        try:
+            for thread in threads:
+                thread.start()
+            # Join with a timeout so Ctrl+C still reaches the calling thread
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(0.5)
+        finally:
+            self.stop()
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join()
+            # Numbers left unprocessed by a stop leave gaps; release what did finish
+            with self.lock:
+                for index in sorted(self.pending):
+                    if self.pending[index]:
+                        self.add_result(self.pending[index])
+                self.pending = {}
+            if self.sink is not None:
+                self.sink.flush()
+            if self.debug_store is not None:
+                self.debug_store.flush()
+            if self.metrics is not None:
+                self.metrics.write_textfile()
+            completed = self.error is None and self.feed is None and self.processed == self.total_numbers
+            with self.lock:
+                self.publish_progress(force=True)
+            self.publish("finished", completed=completed, summary=self.summary())
+
+        if self.error is not None:
+            raise self.error
+        return completed
@@ -0,0 +1,41 @@
+import queue
+
+# Progress events are published at most this often, plus once when the last number is done
+PROGRESS_INTERVAL = 0.25
+
+
+class EventBus:
+    # Thread-safe hand-off from the engine's workers to a front end. Events are plain dicts
+    # with a "type" key:
+    #   progress      processed, total, found, errors, rate (lookups/s), eta (seconds or None)
+    #   status        message
+    #   verification  number; an interactive front end must call engine.resume() when done
+    #   finished      completed, summary
+    # Front ends drain the queue on their own timer, so their refresh cost does not depend
+    # on how fast lookups finish.
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def publish(self, type, **fields):
+        fields["type"] = type
+        self.queue.put(fields)
+
+    def drain(self):
+        events = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                return events
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--:--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def format_progress(event):
+    return (f"Processed: {event['processed']}/{event['total']} | Found: {event['found']} | "
+            f"Errors: {event['errors']} | {event['rate'] * 60:.1f}/min | ETA {format_eta(event['eta'])}")
@@ -0,0 +1,81 @@
+import re
+from lxml import html as lxml_html
+
+from .addresses import normalize_name, parse_address
+
+# Pure functions that turn one page snapshot into a result dict, so a lookup costs a
+# single page_source call instead of a WebDriver round trip per row, cell or field.
+
+
+def text_of(element):
+    return ' '.join(element.text_content().split()) if element is not None else ""
+
+
+def has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def first(element, class_name):
+    if element is None:
+        return None
+    found = element.xpath(f"descendant-or-self::*[{has_class(class_name)}]")
+    return found[0] if found else None
+
+
+def build_americanphonebook_result(number, name, full_address):
+    # Address like "1607 KORNEGAY AVE, WILMINGTON, NC. 28405"; see phonelytics.addresses
+    # for what else it copes with. A partly parsed address also comes back whole in
+    # "Raw Address".
+    result = {"Name": normalize_name(name), "Phone number": number}
+    result.update(parse_address(full_address))
+    result["Country"] = "United States"
+    return result
+
+
+def extract_americanphonebook(page, number):
+    # Returns the first table row listing this number, or {} if there is none
+    doc = lxml_html.fromstring(page)
+    for row in doc.xpath('//table//tr[td]'):
+        cells = [text_of(cell) for cell in row.xpath('./td')]
+        if len(cells) < 4:
+            continue
+        if cells[3] == number:  # First match with this number
+            return build_americanphonebook_result(number, cells[1], cells[2])
+    return {}
+
+
+def extract_thatsthem(page, number):
+    # Returns the first .record on the page, or {} if there is none or it has no name
+    doc = lxml_html.fromstring(page)
+    record = first(doc, "record")
+    name = text_of(first(record, "name"))
+    if not name:
+        return {}
+
+    location = first(record, "location")
+    street = text_of(first(location, "street"))
+    city = text_of(first(location, "city"))
+    state = text_of(first(location, "state"))
+    zip_code = text_of(first(location, "zip")).split('+')[0]
+    age_text = text_of(first(record, "age"))
+
+    # Parse age and DOB
+    dob = ""
+    age = ""
+    if age_text:
+        match = re.search(r"Born (.*?)\((\d+) years old\)", age_text)
+        if match:
+            dob = match.group(1).strip()
+            age = match.group(2).strip()
+
+    return {
+        "Name": name,
+        "Phone number": number,
+        "Address": street,
+        "City": city,
+        "State": state,
+        "Zip Code": zip_code,
+        "Country": "United States",
+        "Date of Birth": dob,
+        "Age": age
+    }
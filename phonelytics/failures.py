@@ -0,0 +1,100 @@
+import json
+import os
+import random
+import time
+from threading import Lock
+from selenium.common.exceptions import (InvalidSessionIdException, NoSuchWindowException, TimeoutException,
+                                        WebDriverException)
+from urllib3.exceptions import HTTPError as Urllib3Error
+import requests
+
+# What became of a lookup. A hit or a miss is final; a transient failure is retried with
+# backoff; a fatal one (the page or our parser is broken for this number) is not.
+HIT = "hit"
+MISS = "miss"
+TRANSIENT = "transient"
+FATAL = "fatal"
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_DELAY = 30
+DEFAULT_MAX_RETRY_DELAY = 600
+
+# Messages WebDriver gives when the browser behind the session is gone
+DEAD_SESSION_MARKERS = [
+    "invalid session id",
+    "session deleted",
+    "session not created",
+    "no such session",
+    "browsing context has been discarded",
+    "failed to decode response from marionette",
+    "tried to run command without establishing a connection",
+    "connection refused",
+    "max retries exceeded",
+]
+
+
+class LookupFailed(Exception):
+    # Raised by providers for failures that are not an exception of their own, e.g. a
+    # verification page nobody can clear
+    def __init__(self, message, transient=True):
+        super().__init__(message)
+        self.transient = transient
+
+
+def classify_error(error):
+    if isinstance(error, LookupFailed):
+        return TRANSIENT if error.transient else FATAL
+    if isinstance(error, (TimeoutException, WebDriverException, requests.RequestException, Urllib3Error, ConnectionError)):
+        return TRANSIENT
+    return FATAL
+
+
+def is_session_dead(error):
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    if isinstance(error, (WebDriverException, Urllib3Error, ConnectionError)):
+        # A geckodriver that died shows up as a refused local connection
+        message = str(error).lower()
+        return any(marker in message for marker in DEAD_SESSION_MARKERS)
+    return False
+
+
+class RetryPolicy:
+    # Exponential backoff for transient failures: retry n waits retry_delay * 2**(n - 1)
+    # seconds, at most max_retry_delay, plus up to 10% jitter so workers do not retry in step
+    def __init__(self, max_retries=DEFAULT_MAX_RETRIES, retry_delay=DEFAULT_RETRY_DELAY, max_retry_delay=DEFAULT_MAX_RETRY_DELAY):
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+    @classmethod
+    def from_config(cls, site_config):
+        return cls(site_config.get("max_retries", DEFAULT_MAX_RETRIES), site_config.get("retry_delay", DEFAULT_RETRY_DELAY),
+                   site_config.get("max_retry_delay", DEFAULT_MAX_RETRY_DELAY))
+
+    def delay(self, attempt):
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** (attempt - 1))
+        return delay + random.uniform(0, delay * 0.1)
+
+
+class DeadLetters:
+    # Append-only JSON-lines file of numbers that failed for good, with the reason, so they
+    # can be looked at or fed back in as a new job
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.lock = Lock()
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def record(self, number, outcome, error, attempts):
+        line = json.dumps({"number": number, "outcome": outcome, "error": f"{type(error).__name__}: {str(error).strip()}",
+                           "attempts": attempts, "time": round(time.time(), 3)}) + "\n"
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.count += 1
+
+    def close(self):
+        with self.lock:
+            self.file.close()
@@ -0,0 +1,325 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+import time
+import os
+from threading import Thread
+from .browser import BrowserProfile
+from .cache import LookupCache
+from .concurrency import ConcurrencyController
+from .config import load_config
+from .debugstore import DebugStore
+from .engine import ScrapeEngine, MAX_NUMBERS
+from .events import EventBus, format_progress
+from .failures import DeadLetters
+from .journal import Journal
+from .loader import InputParser
+from .pacing import RatePolicy
+from .providers import create_provider
+from .sinks import save_results
+from .watchdog import DriverWatchdog
+
+# How often the UI drains engine events, in milliseconds
+REFRESH_MS = 200
+# Numbers shown per page of the input preview
+PREVIEW_PAGE_SIZE = 100
+
+class PhoneScraperApp:
+    # The Tk front end shared by the BOT_*.py scripts. sites is one site name, or several
+    # to cascade through them in that order (see phonelytics.providers.CascadeProvider).
+    def __init__(self, root, sites):
+        self.root = root
+        self.root.title("Phone Number Scraper")
+        self.root.geometry("800x500")
+        self.root.configure(bg="#2c3e50")
+        
+        self.style = ttk.Style()
+        self.style.configure("TButton", font=("Helvetica", 10), padding=5)
+        self.style.configure("TLabel", font=("Helvetica", 11), background="#2c3e50", foreground="white")
+        
+        self.main_frame = ttk.Frame(root, padding="10")
+        self.main_frame.pack(fill="both", expand=True)
+        
+        self.input_label = ttk.Label(self.main_frame, text="Enter Numbers or Load File:")
+        self.input_label.grid(row=0, column=0, pady=5, sticky="w")
+        
+        self.input_text = tk.Text(self.main_frame, height=15, width=50, bg="#34495e", fg="white")
+        self.input_text.grid(row=1, column=0, padx=5, pady=5)
+        
+        # A loaded list is only shown a page at a time, never inserted whole
+        self.input_buttons = ttk.Frame(self.main_frame)
+        self.input_buttons.grid(row=2, column=0, pady=5)
+        self.load_button = ttk.Button(self.input_buttons, text="Load File", command=self.load_file)
+        self.load_button.pack(side="left", padx=2)
+        self.previous_button = ttk.Button(self.input_buttons, text="< Prev", command=lambda: self.show_page(self.page - 1), state="disabled")
+        self.previous_button.pack(side="left", padx=2)
+        self.page_label = ttk.Label(self.input_buttons, text="")
+        self.page_label.pack(side="left", padx=2)
+        self.next_button = ttk.Button(self.input_buttons, text="Next >", command=lambda: self.show_page(self.page + 1), state="disabled")
+        self.next_button.pack(side="left", padx=2)
+        self.clear_button = ttk.Button(self.input_buttons, text="Clear", command=self.clear_input, state="disabled")
+        self.clear_button.pack(side="left", padx=2)
+        
+        self.start_button = ttk.Button(self.main_frame, text="Start Scraping", command=self.start_scraping)
+        self.start_button.grid(row=3, column=0, pady=5)
+        
+        self.stop_button = ttk.Button(self.main_frame, text="Stop Scraping", command=self.stop_scraping, state="disabled")
+        self.stop_button.grid(row=3, column=1, pady=5)
+        
+        self.progress_label = ttk.Label(self.main_frame, text="Progress:")
+        self.progress_label.grid(row=4, column=0, pady=5, sticky="w")
+        
+        self.progress_bar = ttk.Progressbar(self.main_frame, length=300, mode="determinate")
+        self.progress_bar.grid(row=5, column=0, pady=5)
+        
+        self.status_label = ttk.Label(self.main_frame, text="")
+        self.status_label.grid(row=6, column=0, pady=5)
+        
+        self.download_button = ttk.Button(self.main_frame, text="Download Excel Sheet", command=self.save_results, state="disabled")
+        self.download_button.grid(row=7, column=0, pady=5)
+        
+        # None while the text box holds typed or pasted input that has not been checked yet
+        self.numbers = None
+        self.page = 0
+        self.start_when_parsed = False
+        self.input_events = EventBus()
+        self.parser = InputParser(self.input_events)
+        self.stopped = False
+        self.human_verification_popup = None
+        self.thread = None
+        self.events = EventBus()
+        config = load_config()
+        provider = create_provider(sites, config=config)
+        site_config = config.get(provider.name, {})
+        self.engine = ScrapeEngine(provider, workers=site_config.get("workers", 1),
+                                   pacing=RatePolicy.from_config(site_config),
+                                   cache=LookupCache(), debug_store=DebugStore(), events=self.events, interactive=True,
+                                   dead_letters=DeadLetters(f"phonelytics_{provider.name}_failed.jsonl"),
+                                   browser=BrowserProfile.for_sites(config, sites),
+                                   watchdog=DriverWatchdog.from_config(site_config),
+                                   concurrency=ConcurrencyController.from_config(site_config))
+
+    def load_file(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("CSV files", "*.csv"), ("Excel files", "*.xlsx")])
+        if file_path:
+            self.start_when_parsed = False
+            self.parse_input(lambda: self.parser.parse_file(file_path), f"Reading {os.path.basename(file_path)}")
+
+    def parse_input(self, start_parser, message):
+        # Reading and checking the list happens on the parser's thread; poll_input picks up the result
+        self.numbers = None
+        self.set_text("")
+        self.input_text["state"] = "disabled"
+        self.load_button["state"] = "disabled"
+        self.start_button["state"] = "disabled"
+        self.status_label["text"] = f"{message}..."
+        self.parser.cancel()
+        self.input_events.drain()
+        start_parser()
+        self.root.after(REFRESH_MS, self.poll_input)
+
+    def poll_input(self):
+        done = False
+        for event in self.input_events.drain():
+            if event["type"] == "input_progress":
+                self.status_label["text"] = f"Checked {event['rows']:,} rows, {event['kept']:,} numbers kept..."
+            elif event["type"] == "input_ready":
+                self.input_ready(event["numbers"], event["number_filter"])
+                done = True
+            elif event["type"] == "input_failed":
+                messagebox.showerror("Error", f"Failed to load file: {event['message']}")
+                self.clear_input()
+                done = True
+        if not done:
+            self.root.after(REFRESH_MS, self.poll_input)
+
+    def input_ready(self, numbers, number_filter):
+        print(number_filter.summary())
+        self.numbers = numbers
+        self.load_button["state"] = "normal"
+        self.start_button["state"] = "normal"
+        self.clear_button["state"] = "normal"
+        self.status_label["text"] = number_filter.summary()
+        if numbers:
+            self.input_label["text"] = f"{len(numbers):,} numbers, first {numbers[0]}, last {numbers[-1]}:"
+        else:
+            self.input_label["text"] = "No valid numbers:"
+        self.show_page(0)
+        if self.start_when_parsed:
+            self.start_when_parsed = False
+            self.start_scraping()
+
+    def show_page(self, page):
+        pages = max(1, -(-len(self.numbers) // PREVIEW_PAGE_SIZE))
+        self.page = max(0, min(page, pages - 1))
+        start = self.page * PREVIEW_PAGE_SIZE
+        rows = self.numbers[start:start + PREVIEW_PAGE_SIZE]
+        self.set_text('\n'.join(f"{start + i + 1:>7}  {number}" for i, number in enumerate(rows)))
+        self.input_text["state"] = "disabled"
+        self.page_label["text"] = f"Page {self.page + 1:,} of {pages:,}"
+        self.previous_button["state"] = "normal" if self.page > 0 else "disabled"
+        self.next_button["state"] = "normal" if self.page < pages - 1 else "disabled"
+
+    def set_text(self, text):
+        self.input_text["state"] = "normal"
+        self.input_text.delete(1.0, tk.END)
+        self.input_text.insert(tk.END, text)
+
+    def clear_input(self):
+        # Back to an empty text box for typing or pasting numbers
+        self.parser.cancel()
+        self.numbers = None
+        self.start_when_parsed = False
+        self.set_text("")
+        self.input_label["text"] = "Enter Numbers or Load File:"
+        self.page_label["text"] = ""
+        for button in (self.previous_button, self.next_button, self.clear_button):
+            button["state"] = "disabled"
+        self.load_button["state"] = "normal"
+        self.start_button["state"] = "normal"
+
+    def show_human_verification_popup(self):
+        if not self.human_verification_popup:
+            self.human_verification_popup = tk.Toplevel(self.root)
+            self.human_verification_popup.title("Human Verification Required")
+            self.human_verification_popup.geometry("400x200")
+            self.human_verification_popup.configure(bg="#2c3e50")
+            self.human_verification_popup.transient(self.root)
+            self.human_verification_popup.grab_set()
+
+            ttk.Label(self.human_verification_popup, text="The website requires human verification or signup.\nPlease complete the verification in the browser,\nthen click 'Done' to resume.", font=("Helvetica", 11), background="#2c3e50", foreground="white").pack(pady=20)
+            ttk.Button(self.human_verification_popup, text="Done", command=self.resume_after_verification).pack(pady=10)
+
+    def resume_after_verification(self):
+        if self.human_verification_popup:
+            self.human_verification_popup.destroy()
+            self.human_verification_popup = None
+        self.engine.resume()
+        self.status_label["text"] = "Resuming scraping..."
+
+    def start_scraping(self):
+        if self.thread and self.thread.is_alive():
+            messagebox.showwarning("Warning", "The previous job is still stopping, try again in a moment.")
+            return
+
+        if self.parser.is_running():
+            return
+        if self.numbers is None:
+            # Typed or pasted input is checked off the UI thread too; the job starts once it is
+            lines = self.input_text.get(1.0, tk.END).split('\n')
+            self.start_when_parsed = True
+            self.parse_input(lambda: self.parser.parse_lines(lines), "Checking numbers")
+            return
+
+        if not self.numbers:
+            messagebox.showerror("Error", "No valid phone numbers detected!")
+            return
+            
+        if len(self.numbers) > MAX_NUMBERS:
+            messagebox.showerror("Error", "Maximum 100,000 numbers allowed!")
+            return
+            
+        self.open_journal()
+        self.progress_bar["maximum"] = len(self.numbers)
+        self.start_button["state"] = "disabled"
+        self.stop_button["state"] = "normal"
+        self.download_button["state"] = "disabled"
+        self.load_button["state"] = "disabled"
+        self.clear_button["state"] = "disabled"
+        self.status_label["text"] = f"Starting {len(self.numbers):,} lookups..."
+        self.stopped = False
+        
+        self.thread = Thread(target=self.process_numbers, daemon=True)
+        self.thread.start()
+        self.root.after(REFRESH_MS, self.poll_events)
+
+    def stop_scraping(self):
+        self.engine.stop()
+        self.stopped = True
+        self.stop_button["state"] = "disabled"
+        self.start_button["state"] = "normal"
+        self.download_button["state"] = "normal" if self.engine.results else "disabled"
+        self.status_label["text"] = f"Scraping stopped - {len(self.engine.results)} numbers processed. Click 'Download Excel Sheet' to save results."
+        self.load_button["state"] = "normal"
+        self.clear_button["state"] = "normal"
+        self.progress_bar["value"] = 0  # Input is kept so the job can be resumed from the journal
+
+    def open_journal(self):
+        # Every finished lookup is journaled so a crashed or stopped job can be picked up again
+        journal_path = f"phonelytics_{self.engine.scraper.name}_journal.jsonl"
+        resume = os.path.exists(journal_path) and os.path.getsize(journal_path) > 0 and messagebox.askyesno(
+            "Resume", "A previous job was found. Continue it and skip the numbers it already looked up?")
+        if self.engine.journal:
+            self.engine.journal.close()
+        self.engine.journal = Journal(journal_path, resume=resume)
+
+    def process_numbers(self):
+        # Runs on the worker thread; the engine reports back through self.events
+        try:
+            self.engine.run(self.numbers)
+        except Exception as e:
+            print(f"Scraping failed: {str(e)}")
+
+    def poll_events(self):
+        # Widgets are only touched here, on the Tk thread, at a fixed refresh rate
+        finished = None
+        for event in self.events.drain():
+            if event["type"] == "progress":
+                self.update_progress(event)
+            elif event["type"] == "status":
+                self.status_label["text"] = event["message"]
+            elif event["type"] == "verification":
+                self.show_human_verification_popup()
+            elif event["type"] == "finished":
+                finished = event
+        if finished:
+            self.scraping_finished(finished)
+        else:
+            self.root.after(REFRESH_MS, self.poll_events)
+
+    def update_progress(self, event):
+        if self.stopped:
+            return
+        self.progress_bar["value"] = event["processed"]
+        self.status_label["text"] = format_progress(event)
+
+    def scraping_finished(self, event):
+        if self.stopped:  # stop_scraping has already reset the UI
+            return
+        self.start_button["state"] = "normal"
+        self.stop_button["state"] = "disabled"
+        self.load_button["state"] = "normal"
+        self.clear_button["state"] = "normal"
+        self.download_button["state"] = "normal" if self.engine.results else "disabled"
+        if event["completed"]:
+            self.status_label["text"] = f"Scraping complete ({event['summary']}) - Click 'Download Excel Sheet' to save results"
+        else:
+            error = str(self.engine.error or "the job ended early").strip()
+            self.status_label["text"] = f"Scraping failed ({event['summary']}) - Results so far can still be downloaded"
+            messagebox.showerror("Error", f"Scraping failed: {error}")
+
+    def save_results(self):
+        if not self.engine.results:
+            messagebox.showwarning("Warning", "No data found to save!")
+            return
+            
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        default_filename = f"phone_search_results_{timestamp}.xlsx"
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            initialfile=default_filename,
+            filetypes=[("Excel files", "*.xlsx"), ("Parquet files", "*.parquet"), ("CSV files", "*.csv")])
+            
+        if file_path:
+            try:
+                save_results(self.engine.results, file_path)
+                self.status_label["text"] = f"Results saved to {os.path.basename(file_path)}"
+                messagebox.showinfo("Success", f"Results saved to {file_path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save file: {str(e)}")
+
+
+def main(sites):
+    root = tk.Tk()
+    app = PhoneScraperApp(root, sites)
+    root.mainloop()
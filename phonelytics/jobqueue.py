@@ -0,0 +1,259 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+from threading import Lock
+
+from .loader import iter_batches, iter_lines
+from .nanp import NumberFilter
+
+DEFAULT_LEASE_SECONDS = 600
+DEFAULT_CLAIM_SIZE = 20
+DEFAULT_MAX_ATTEMPTS = 3
+# How often an idle worker checks whether a lease held by another worker has run out
+IDLE_POLL = 30
+# How often it checks while the only leases left are its own, still being looked up
+CLAIM_POLL = 2
+# How long a connection waits for another worker's write to finish before giving up
+BUSY_TIMEOUT = 60
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+def worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class JobQueue:
+    # A lookup job stored in one SQLite file that any number of worker processes, on this
+    # machine or others sharing the volume, pull from. Workers claim small batches with a
+    # lease of lease_seconds; a lease that runs out (the worker died or hung) puts its
+    # numbers back up for grabs. Results are written back per number and a number that is
+    # already done is never overwritten, so a late or repeated write is harmless. Numbers
+    # that fail max_attempts times are parked as failed.
+    # The default rollback journal is used rather than WAL, which does not work on
+    # network file systems; every write is a short BEGIN IMMEDIATE transaction.
+    def __init__(self, path, lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker = worker_id()
+        self.lock = Lock()
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        self.conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT * 1000}")
+        with self.transaction():
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    number TEXT NOT NULL UNIQUE,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    finished_at REAL
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS items_status ON items (status, lease_expires)")
+            # Pending numbers are claimed in id order straight off this index, without a sort
+            self.conn.execute("CREATE INDEX IF NOT EXISTS items_status_id ON items (status, id)")
+
+    def transaction(self):
+        return Transaction(self)
+
+    def add(self, numbers):
+        # Loading the same list twice adds nothing; ids keep the input order
+        with self.transaction():
+            before = self.conn.total_changes
+            self.conn.executemany("INSERT OR IGNORE INTO items (number) VALUES (?)", ((number,) for number in numbers))
+            return self.conn.total_changes - before
+
+    def load_file(self, file_path, column=None):
+        # Streams the file in batches, so the list never has to fit in memory
+        number_filter = NumberFilter()
+        added = 0
+        for batch in iter_batches(iter_lines(file_path, column)):
+            added += self.add(number_filter.filter(batch))
+        return added, number_filter
+
+    def claim(self, size=DEFAULT_CLAIM_SIZE):
+        # Leases up to size pending numbers, or numbers whose lease ran out, to this worker.
+        # A number whose lease ran out max_attempts times (it keeps taking its worker down)
+        # is marked failed instead.
+        now = time.time()
+        with self.transaction():
+            self.conn.execute("UPDATE items SET status = ?, lease_expires = NULL "
+                              "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                              (FAILED, LEASED, now, self.max_attempts))
+            # Two queries, each served by its own index, while the write lock is held
+            rows = self.conn.execute(
+                "SELECT id, number FROM items WHERE status = ? AND lease_expires < ? ORDER BY id LIMIT ?",
+                (LEASED, now, size)).fetchall()
+            if len(rows) < size:
+                rows += self.conn.execute("SELECT id, number FROM items WHERE status = ? ORDER BY id LIMIT ?",
+                                          (PENDING, size - len(rows))).fetchall()
+            self.conn.executemany(
+                "UPDATE items SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                ((LEASED, self.worker, now + self.lease_seconds, item_id) for item_id, number in rows))
+        return rows
+
+    def complete(self, number, result):
+        # None is a failed lookup: the number goes back to the queue until it runs out of
+        # attempts. Finishing a number also renews the lease on the rest of the batch.
+        with self.transaction():
+            if result is not None:
+                self.conn.execute(
+                    "UPDATE items SET status = ?, result = ?, worker = ?, lease_expires = NULL, finished_at = ? "
+                    "WHERE number = ? AND status != ?",
+                    (DONE, json.dumps(result), self.worker, time.time(), number, DONE))
+            else:
+                self.conn.execute(
+                    "UPDATE items SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, lease_expires = NULL "
+                    "WHERE number = ? AND status = ? AND worker = ?",
+                    (self.max_attempts, FAILED, PENDING, number, LEASED, self.worker))
+            self.conn.execute("UPDATE items SET lease_expires = ? WHERE status = ? AND worker = ?",
+                              (time.time() + self.lease_seconds, LEASED, self.worker))
+
+    def release(self):
+        # Hands back whatever this worker still holds, e.g. after it was stopped
+        with self.transaction():
+            self.conn.execute("UPDATE items SET status = ?, lease_expires = NULL, attempts = attempts - 1 "
+                              "WHERE status = ? AND worker = ?", (PENDING, LEASED, self.worker))
+
+    def counts(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update(rows)
+        return counts
+
+    def is_drained(self):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM items WHERE status IN (?, ?) LIMIT 1",
+                                     (PENDING, LEASED)).fetchone() is None
+
+    def leased_elsewhere(self):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM items WHERE status = ? AND worker != ? LIMIT 1",
+                                     (LEASED, self.worker)).fetchone() is not None
+
+    def results(self):
+        # Found results in input order, read in pages so the whole job never sits in memory
+        last_id = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT id, result FROM items WHERE status = ? AND result != '{}' AND id > ? ORDER BY id LIMIT 1000",
+                    (DONE, last_id)).fetchall()
+            if not rows:
+                return
+            for last_id, result in rows:
+                yield json.loads(result)
+
+    def summary(self):
+        counts = self.counts()
+        return " | ".join(f"{status.capitalize()}: {count}" for status, count in counts.items())
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class Transaction:
+    # BEGIN IMMEDIATE takes the write lock up front, so two workers can never both read
+    # the same pending rows and then both lease them
+    def __init__(self, job):
+        self.job = job
+
+    def __enter__(self):
+        self.job.lock.acquire()
+        try:
+            self.job.conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self.job.lock.release()
+            raise
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.job.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.job.lock.release()
+
+
+class JobJournal:
+    # Takes the place of the engine's journal while it works through the queue, so every
+    # finished lookup is written back as soon as it is done
+    def __init__(self, job):
+        self.job = job
+        self.done = set()
+
+    def record(self, number, result):
+        self.job.complete(number, result)
+
+    def results(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class DiscardSink:
+    # The queue already holds every result, so the engine need not keep them as well
+    def write(self, result):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class JobWorker:
+    # Runs the engine once for the whole job: its workers and browsers stay up while
+    # claim_size numbers at a time are leased from the queue whenever the engine runs out.
+    # When the rest of the job is leased to other workers it keeps polling, so it picks
+    # up the work of any worker that dies.
+    def __init__(self, engine, job, claim_size=DEFAULT_CLAIM_SIZE):
+        self.engine = engine
+        self.job = job
+        self.claim_size = claim_size
+        self.stopped = False
+        self.next_claim = 0.0
+
+    def stop(self):
+        self.stopped = True
+        self.engine.stop()
+
+    def claim(self):
+        # The engine's feed: more numbers, [] to be asked again later, or None once the job is drained
+        if self.stopped:
+            return None
+        if time.monotonic() < self.next_claim:
+            return []
+        rows = self.job.claim(self.claim_size)
+        if rows:
+            return [number for item_id, number in rows]
+        if self.job.is_drained():
+            return None
+        if self.job.leased_elsewhere():
+            self.engine.report_status(f"Waiting for leases held by other workers ({self.job.summary()})")
+            self.next_claim = time.monotonic() + IDLE_POLL
+        else:
+            self.next_claim = time.monotonic() + CLAIM_POLL
+        return []
+
+    def run(self):
+        self.engine.journal = JobJournal(self.job)
+        if self.engine.sink is None:
+            self.engine.sink = DiscardSink()
+        try:
+            self.engine.run([], feed=self.claim)
+        finally:
+            self.job.release()
+
+    def summary(self):
+        return f"This worker: {self.engine.summary()} | Job: {self.job.summary()}"
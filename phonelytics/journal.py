@@ -0,0 +1,69 @@
+import json
+import os
+from threading import Lock
+
+
+class Journal:
+    # Append-only JSON-lines record of every processed number. Each line is flushed and
+    # fsynced before the next lookup starts, so a crash loses at most the line being
+    # written; a torn last line is cut off the next time the journal is opened. Only the
+    # done numbers are held in memory; their results are read back from the file.
+    def __init__(self, path, resume=True):
+        self.path = path
+        self.done = set()
+        self.lock = Lock()
+        if resume and os.path.exists(path):
+            self.load()
+        else:
+            open(path, 'wb').close()
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def entries(self):
+        # (size, entry) for every complete line, stopping at a torn or garbled one
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    return
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    return
+                yield len(line), entry
+
+    def load(self):
+        good_size = 0
+        for size, entry in self.entries():
+            good_size += size
+            # Failed lookups are journaled too but are retried on resume
+            if entry["result"] is not None:
+                self.done.add(entry["number"])
+            else:
+                self.done.discard(entry["number"])
+        if good_size != os.path.getsize(self.path):
+            print(f"Discarding incomplete entry at the end of {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_size)
+
+    def record(self, number, result):
+        line = json.dumps({"number": number, "result": result}) + "\n"
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            if result is not None:
+                self.done.add(number)
+
+    def results(self):
+        # Found results of the done numbers, streamed from the file in the order they finished
+        with self.lock:
+            self.file.flush()
+        returned = set()
+        for size, entry in self.entries():
+            number = entry["number"]
+            if entry["result"] and number in self.done and number not in returned:
+                returned.add(number)
+                yield entry["result"]
+
+    def close(self):
+        with self.lock:
+            self.file.close()
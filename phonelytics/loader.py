@@ -0,0 +1,148 @@
+from itertools import islice
+from threading import Thread
+from openpyxl import load_workbook
+import pandas as pd
+
+from .engine import format_phone_number
+from .nanp import NumberFilter
+
+CSV_CHUNK_SIZE = 10000
+BATCH_SIZE = 10000
+
+
+def cell_to_text(value):
+    if value is None:
+        return ""
+    # Spreadsheet numbers come back as floats when the column has blanks, e.g. 9105551234.0
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def iter_txt(file_path, column=None):
+    if column is not None:
+        raise ValueError("Column selection is only supported for .csv and .xlsx files")
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield line.rstrip('\r\n')
+
+
+def iter_csv(file_path, column=None):
+    usecols = [column if column is not None else 0]
+    try:
+        reader = pd.read_csv(file_path, usecols=usecols, dtype=str, keep_default_na=False, chunksize=CSV_CHUNK_SIZE)
+    except ValueError:
+        header = pd.read_csv(file_path, nrows=0).columns
+        raise ValueError(f"Column '{column}' not found, available columns: {', '.join(map(str, header))}")
+    with reader:
+        for chunk in reader:
+            for value in chunk.iloc[:, 0]:
+                yield value
+
+
+def iter_xlsx(file_path, column=None):
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        index = 0
+        if column is not None:
+            names = [cell_to_text(name).strip() for name in header]
+            if column not in names:
+                raise ValueError(f"Column '{column}' not found, available columns: {', '.join(names)}")
+            index = names.index(column)
+        for row in rows:
+            yield cell_to_text(row[index]) if index < len(row) else ""
+    finally:
+        workbook.close()
+
+
+READERS = {
+    '.txt': iter_txt,
+    '.csv': iter_csv,
+    '.xlsx': iter_xlsx,
+}
+
+
+def iter_lines(file_path, column=None):
+    # Yields the raw phone column one row at a time; the first row of .csv/.xlsx files is the header
+    for extension, reader in READERS.items():
+        if file_path.lower().endswith(extension):
+            return reader(file_path, column)
+    raise ValueError(f"Unsupported file type: {file_path}")
+
+
+def iter_numbers(file_path, column=None):
+    for line in iter_lines(file_path, column):
+        number = format_phone_number(line)
+        if number:
+            yield number
+
+
+def iter_batches(lines, size=BATCH_SIZE):
+    lines = iter(lines)
+    while True:
+        batch = list(islice(lines, size))
+        if not batch:
+            return
+        yield batch
+
+
+def load_numbers(file_path, column=None):
+    # Reads, validates and de-duplicates the file in batches; returns the numbers and the filter with its counts
+    number_filter = NumberFilter()
+    numbers = []
+    for batch in iter_batches(iter_lines(file_path, column)):
+        numbers.extend(number_filter.filter(batch))
+    return numbers, number_filter
+
+
+class InputParser:
+    # Reads and checks an input list on a background thread, so a front end stays
+    # responsive however long the list is. Publishes to events (see phonelytics.events):
+    #   input_progress  rows, kept; after every batch
+    #   input_ready     numbers, number_filter
+    #   input_failed    message
+    def __init__(self, events):
+        self.events = events
+        self.thread = None
+        self.cancelled = False
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def parse_file(self, file_path, column=None):
+        self.start(lambda: iter_lines(file_path, column))
+
+    def parse_lines(self, lines):
+        self.start(lambda: lines)
+
+    def start(self, open_lines):
+        self.cancel()
+        self.cancelled = False
+        self.thread = Thread(target=self.run, args=(open_lines,), daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        # The thread stops after its current batch and publishes nothing more
+        self.cancelled = True
+        if self.thread is not None:
+            self.thread.join()
+
+    def run(self, open_lines):
+        number_filter = NumberFilter()
+        numbers = []
+        try:
+            for batch in iter_batches(open_lines()):
+                if self.cancelled:
+                    return
+                numbers.extend(number_filter.filter(batch))
+                self.events.publish("input_progress", rows=number_filter.total, kept=number_filter.kept)
+        except Exception as e:
+            if not self.cancelled:
+                self.events.publish("input_failed", message=str(e))
+            return
+        if not self.cancelled:
+            self.events.publish("input_ready", numbers=numbers, number_filter=number_filter)
@@ -0,0 +1,150 @@
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from threading import Lock
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import requests
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+# The Prometheus textfile is rewritten at most this often while a job runs
+TEXTFILE_INTERVAL = 15
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+class Metrics:
+    # Times each stage of a lookup (driver_start, navigate, locate, type, submit,
+    # result_wait, tab_switch, extract) per site and counts lookup outcomes. Every timed
+    # stage is appended to log_path as one JSON line; textfile_path gets the histograms
+    # and counters in the Prometheus text format for node_exporter's textfile collector.
+    def __init__(self, log_path=None, textfile_path=None, buckets=DEFAULT_BUCKETS):
+        self.log_path = log_path
+        self.textfile_path = textfile_path
+        self.buckets = buckets
+        self.histograms = {}
+        self.outcomes = {}
+        self.lock = Lock()
+        self.last_textfile = 0.0
+        self.log = open(log_path, "a", encoding="utf-8") if log_path else None
+
+    @contextmanager
+    def stage(self, site, stage, number=None):
+        started = time.monotonic()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.observe(site, stage, time.monotonic() - started, number, error)
+
+    def observe(self, site, stage, seconds, number=None, error=None):
+        with self.lock:
+            histogram = self.histograms.get((site, stage))
+            if histogram is None:
+                histogram = self.histograms[(site, stage)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            if self.log is not None:
+                entry = {"time": round(time.time(), 3), "site": site, "stage": stage, "number": number,
+                         "seconds": round(seconds, 4), "ok": error is None}
+                if error is not None:
+                    entry["error"] = type(error).__name__
+                self.log.write(json.dumps(entry) + "\n")
+                self.log.flush()
+
+    def record_outcome(self, site, result, error=None):
+        if error is not None:
+            outcome = classify_failure(error)
+        elif result:
+            outcome = "hit"
+        else:
+            outcome = "no_result"
+        with self.lock:
+            self.outcomes[(site, outcome)] = self.outcomes.get((site, outcome), 0) + 1
+            due = time.monotonic() - self.last_textfile >= TEXTFILE_INTERVAL
+        if due:
+            self.write_textfile()
+        return outcome
+
+    def write_textfile(self):
+        if not self.textfile_path:
+            return
+        with self.lock:
+            self.last_textfile = time.monotonic()
+            text = self.render()
+        # Written aside and renamed so node_exporter never reads a half-written file
+        temp_path = f"{self.textfile_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, self.textfile_path)
+
+    def render(self):
+        lines = [
+            "# HELP phonelytics_stage_duration_seconds Time spent in each stage of a lookup.",
+            "# TYPE phonelytics_stage_duration_seconds histogram",
+        ]
+        for (site, stage), histogram in sorted(self.histograms.items()):
+            labels = f'site="{site}",stage="{stage}"'
+            for bound, count in histogram.cumulative():
+                lines.append(f'phonelytics_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'phonelytics_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"phonelytics_stage_duration_seconds_sum{{{labels}}} {histogram.sum:.6f}")
+            lines.append(f"phonelytics_stage_duration_seconds_count{{{labels}}} {histogram.count}")
+        lines += [
+            "# HELP phonelytics_lookups_total Lookups by outcome.",
+            "# TYPE phonelytics_lookups_total counter",
+        ]
+        for (site, outcome), count in sorted(self.outcomes.items()):
+            lines.append(f'phonelytics_lookups_total{{site="{site}",outcome="{outcome}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        with self.lock:
+            stages = [f"{stage} {histogram.sum / histogram.count:.2f}s" for (site, stage), histogram
+                      in sorted(self.histograms.items(), key=lambda item: -item[1].sum)]
+            outcomes = [f"{outcome} {count}" for (site, outcome), count in sorted(self.outcomes.items())]
+        return f"Average stage times: {', '.join(stages) or '-'} | Outcomes: {', '.join(outcomes) or '-'}"
+
+    def close(self):
+        self.write_textfile()
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+
+def classify_failure(error):
+    if isinstance(error, (TimeoutException, requests.Timeout)):
+        return "timeout"
+    if isinstance(error, (WebDriverException, requests.RequestException)):
+        return "driver_error"
+    return "error"
+
+
+def timed(engine, site, number, stage):
+    # Times a block against the engine's metrics, if it has any
+    if engine is None or engine.metrics is None:
+        return nullcontext()
+    return engine.metrics.stage(site, stage, number)
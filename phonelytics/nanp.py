@@ -0,0 +1,87 @@
+import os
+import pandas as pd
+
+NPA_TABLE = os.path.join(os.path.dirname(__file__), 'data', 'npa.csv')
+
+# Reasons a row is dropped before it reaches the browser, in the order they are checked
+REASONS = ["malformed", "invalid_area_code", "invalid_exchange", "fictional", "duplicate"]
+
+_area_codes = None
+
+
+def area_codes():
+    # US and territory area codes in service, keyed by NPA with the state as value
+    global _area_codes
+    if _area_codes is None:
+        table = pd.read_csv(NPA_TABLE, dtype=str)
+        _area_codes = dict(zip(table['npa'], table['state']))
+    return _area_codes
+
+
+def normalize_series(values):
+    # Same rules as format_phone_number, applied to a whole column: 10 digits with an optional 1/+1 prefix
+    cleaned = pd.Series(values, dtype=object).fillna('').astype(str).str.replace(r'[^\d+]', '', regex=True)
+    return cleaned.str.extract(r'^(?:\+1|1)?(\d{10})$', expand=False)
+
+
+def classify_series(numbers):
+    # Returns the first failing reason for each normalized number, or None if it is dialable
+    npa = numbers.str[:3]
+    nxx = numbers.str[3:6]
+    line = numbers.str[6:]
+    reasons = pd.Series(None, index=numbers.index, dtype=object)
+    checks = [
+        ("malformed", numbers.isna()),
+        ("invalid_area_code", ~npa.isin(area_codes().keys())),
+        ("invalid_exchange", nxx.str[0].isin(['0', '1']) | (nxx.str[1:] == '11')),
+        ("fictional", (nxx == '555') & line.str.startswith('01')),
+    ]
+    for reason, mask in checks:
+        reasons = reasons.mask(reasons.isna() & mask.fillna(False).astype(bool), reason)
+    return reasons
+
+
+class NumberFilter:
+    # Normalizes, validates and de-duplicates numbers batch by batch while keeping input order.
+    # One filter instance is used per job so duplicates are caught across batches.
+    def __init__(self):
+        self.seen = set()
+        self.total = 0
+        self.counts = dict.fromkeys(REASONS, 0)
+
+    @property
+    def kept(self):
+        return len(self.seen)
+
+    @property
+    def removed(self):
+        return self.total - self.kept
+
+    def filter(self, values):
+        values = pd.Series(values, dtype=object).fillna('').astype(str).str.strip()
+        numbers = normalize_series(values[values != ''])
+        self.total += len(numbers)
+        if numbers.empty:
+            return []
+
+        reasons = classify_series(numbers)
+        duplicate = numbers.duplicated(keep='first') | numbers.isin(self.seen)
+        reasons = reasons.mask(reasons.isna() & duplicate, "duplicate")
+        for reason, count in reasons.value_counts().items():
+            self.counts[reason] += int(count)
+
+        kept = numbers[reasons.isna()].tolist()
+        self.seen.update(kept)
+        return kept
+
+    def summary(self):
+        text = f"Kept {self.kept:,} of {self.total:,} rows"
+        removed = [f"{count:,} {reason.replace('_', ' ')}" for reason, count in self.counts.items() if count]
+        if removed:
+            text += f" (removed {', '.join(removed)})"
+        return text
+
+
+def filter_numbers(values):
+    number_filter = NumberFilter()
+    return number_filter.filter(values), number_filter
@@ -0,0 +1,41 @@
+import random
+import time
+from threading import Lock
+
+
+class RatePolicy:
+    # Spaces out lookup starts against one site: at most requests_per_minute, never closer
+    # than min_interval seconds, plus up to jitter seconds of random extra gap. Safe to share
+    # between threads; each caller reserves its own slot.
+    def __init__(self, requests_per_minute=None, min_interval=0.0, jitter=0.0):
+        self.requests_per_minute = requests_per_minute
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.next_allowed = 0.0
+        self.lock = Lock()
+
+    @classmethod
+    def from_config(cls, site_config):
+        return cls(site_config.get("requests_per_minute"), site_config.get("min_interval", 0.0),
+                   site_config.get("jitter", 0.0))
+
+    @property
+    def interval(self):
+        interval = self.min_interval
+        if self.requests_per_minute:
+            interval = max(interval, 60.0 / self.requests_per_minute)
+        return interval
+
+    def reserve(self):
+        # Returns how long the caller has to wait before its request may start
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_allowed)
+            self.next_allowed = start + self.interval + random.uniform(0, self.jitter)
+            return start - now
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
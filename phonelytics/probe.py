@@ -0,0 +1,67 @@
+import re
+
+PROBE_SCRIPT = """
+var config = arguments[0];
+var text = null;
+function anyMarker(patterns) {
+    if (!patterns.length) return false;
+    // Only the visible text is searched, read once per probe and only when a selector did not decide
+    if (text === null) text = document.body ? document.body.textContent : '';
+    for (var i = 0; i < patterns.length; i++) {
+        if (new RegExp(patterns[i], 'i').test(text)) return true;
+    }
+    return false;
+}
+function anySelector(selectors) {
+    for (var i = 0; i < selectors.length; i++) {
+        if (document.querySelector(selectors[i])) return true;
+    }
+    return false;
+}
+return {
+    ready: document.readyState,
+    results: anySelector(config.results_selectors) || anyMarker(config.results_markers),
+    no_results: anySelector(config.no_results_selectors) || anyMarker(config.no_results_markers),
+    verification: anySelector(config.verification_selectors) || anyMarker(config.verification_markers)
+};
+"""
+
+
+def marker_pattern(marker):
+    # A case-insensitive RegExp matches without building a lower-cased copy of the text
+    return re.sub(r"[.*+?^${}()|[\]\\/]", lambda match: "\\" + match.group(), marker)
+
+
+class PageProbe:
+    # Reads the page state the waits care about in one execute_script call. Selectors are
+    # checked first; text markers are searched case-insensitively in the page's text, not
+    # its markup, and only cross the WebDriver connection as a handful of booleans.
+    def __init__(self, results_selectors=(), results_markers=(), no_results_selectors=(), no_results_markers=(),
+                 verification_selectors=(), verification_markers=()):
+        self.config = {
+            "results_selectors": list(results_selectors),
+            "results_markers": [marker_pattern(marker) for marker in results_markers],
+            "no_results_selectors": list(no_results_selectors),
+            "no_results_markers": [marker_pattern(marker) for marker in no_results_markers],
+            "verification_selectors": list(verification_selectors),
+            "verification_markers": [marker_pattern(marker) for marker in verification_markers],
+        }
+
+    def state(self, driver):
+        return driver.execute_script(PROBE_SCRIPT, self.config)
+
+    def wait_for(self, wait, condition):
+        # Polls the probe until condition(state) holds and returns that state
+        def check(driver):
+            state = self.state(driver)
+            return state if condition(state) else False
+        return wait.until(check)
+
+
+def is_ready(state):
+    # The DOM is parsed; images, fonts and late scripts may still be loading
+    return state["ready"] in ("interactive", "complete")
+
+
+def is_answered(state):
+    return is_ready(state) and (state["results"] or state["no_results"] or state["verification"])
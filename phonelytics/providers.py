@@ -0,0 +1,111 @@
+from threading import Lock
+
+from .americanphonebook import AmericanPhoneBookScraper
+from .americanphonebook_http import AmericanPhoneBookHttpScraper
+from .config import load_config
+from .failures import is_session_dead
+from .pacing import RatePolicy
+from .thatsthem import ThatsthemScraper
+
+# A provider looks numbers up on one source. It has a `name` (also its key in the config,
+# cache, journal and metrics), `uses_driver` (whether the engine has to hand it a
+# WebDriver) and scrape_phone_info(driver, number, engine), which returns a result dict or
+# {} when the source confirmed there is no match, and raises when the lookup failed (see
+# phonelytics.failures for how the engine tells transient failures from fatal ones).
+
+PROVIDERS = {
+    AmericanPhoneBookScraper.name: AmericanPhoneBookScraper,
+    ThatsthemScraper.name: ThatsthemScraper,
+}
+
+# Sources that can also be looked up without a browser
+HTTP_PROVIDERS = {
+    AmericanPhoneBookHttpScraper.name: AmericanPhoneBookHttpScraper,
+}
+
+# Cheapest first: americanphonebook answers a single form post, thatsthem opens a new tab
+# per search and may ask for human verification
+DEFAULT_CASCADE = [AmericanPhoneBookScraper.name, ThatsthemScraper.name]
+DEFAULT_REQUIRED_FIELDS = ("Name",)
+
+
+class CascadeProvider:
+    # Looks a number up on each provider in turn and stops at the first point where the
+    # merged result has every field in required_fields. Fields an earlier provider left
+    # blank are filled in from later ones, so requiring "Date of Birth" sends americanphonebook
+    # hits on to thatsthem for DOB and Age, while the default only sends misses and failures
+    # on. Each provider is paced by its own RatePolicy.
+    def __init__(self, providers, pacings=None, required_fields=DEFAULT_REQUIRED_FIELDS):
+        self.providers = providers
+        self.pacings = pacings if pacings is not None else [RatePolicy() for _ in providers]
+        self.required_fields = required_fields
+        self.name = "+".join(provider.name for provider in providers)
+        self.uses_driver = any(provider.uses_driver for provider in providers)
+        self.queried = {provider.name: 0 for provider in providers}
+        self.answered = {provider.name: 0 for provider in providers}
+        self.lock = Lock()
+
+    def is_complete(self, result):
+        return all(result.get(field) for field in self.required_fields)
+
+    def scrape_phone_info(self, driver, number, engine=None):
+        merged = {}
+        error = None
+        for provider, pacing in zip(self.providers, self.pacings):
+            delay = pacing.wait()
+            if engine is not None:
+                engine.paced(delay)
+            with self.lock:
+                self.queried[provider.name] += 1
+            try:
+                result = provider.scrape_phone_info(driver if provider.uses_driver else None, number, engine)
+            except Exception as e:
+                # The next provider cannot use a browser that just died either
+                if is_session_dead(e):
+                    raise
+                error = e
+                continue
+            if result:
+                with self.lock:
+                    self.answered[provider.name] += 1
+                for field, value in result.items():
+                    if not merged.get(field):
+                        merged[field] = value
+            if merged and self.is_complete(merged):
+                return merged
+        if merged:
+            return merged
+        # Only a miss everywhere is a confirmed miss; otherwise the failure is passed on
+        if error is not None:
+            raise error
+        return {}
+
+    def summary(self):
+        with self.lock:
+            return "Cascade: " + ", ".join(f"{name} {self.answered[name]}/{self.queried[name]} answered"
+                                           for name in self.queried)
+
+
+def create_provider(sites, backend="browser", config=None, required_fields=DEFAULT_REQUIRED_FIELDS):
+    # One site gives its provider; several give a CascadeProvider in that order. With the
+    # http backend, sites that support it are looked up without a browser.
+    if isinstance(sites, str):
+        sites = [sites]
+    config = config if config is not None else load_config()
+    providers = []
+    for site in sites:
+        if site not in PROVIDERS:
+            raise ValueError(f"Unknown site: {site}")
+        provider_class = HTTP_PROVIDERS.get(site, PROVIDERS[site]) if backend == "http" else PROVIDERS[site]
+        providers.append(provider_class(page_timeout=config.get(site, {}).get("page_timeout", 30)))
+    if backend == "http" and not any(site in HTTP_PROVIDERS for site in sites):
+        raise ValueError(f"The http backend is not available for {', '.join(sites)}")
+    if len(providers) == 1:
+        return providers[0]
+    pacings = [RatePolicy.from_config(config.get(site, {})) for site in sites]
+    for provider, pacing in zip(providers, pacings):
+        # The engine's pacing belongs to the cascade, so a provider that makes requests of
+        # its own during a lookup (the http backend's browser fallback) shares its site's
+        if hasattr(provider, "pacing"):
+            provider.pacing = pacing
+    return CascadeProvider(providers, pacings, required_fields)
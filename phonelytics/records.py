@@ -0,0 +1,247 @@
+import datetime
+import re
+
+from .sinks import RESULT_COLUMNS
+
+# Result column -> ResultRecord attribute
+FIELDS = dict(zip(RESULT_COLUMNS, ["name", "phone_number", "address", "city", "state", "zip_code", "country",
+                                   "date_of_birth", "age", "raw_address"]))
+# The site's own date of birth text, kept next to the typed date whenever the two differ
+RAW_DATE_COLUMN = "Date of Birth (raw)"
+TABLE_FIELDS = dict(FIELDS, **{RAW_DATE_COLUMN: "raw_date_of_birth"})
+DATE_FORMATS = ["%B %d, %Y", "%b %d, %Y", "%m/%d/%Y", "%Y-%m-%d"]
+RECORD_BATCH_SIZE = 1000
+GROUP_KEYS = ["state", "zip_prefix", "age_range"]
+
+
+def parse_age(text):
+    match = re.search(r"\d+", str(text or ""))
+    return int(match.group()) if match else None
+
+
+def parse_date(text):
+    text = " ".join(str(text or "").split())
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format).date()
+        except ValueError:
+            pass
+    return None
+
+
+def split_date(value):
+    # (date, raw text): the raw text is only kept when it cannot be parsed or is written
+    # differently from format_date, so it can be given back exactly as the site had it
+    if isinstance(value, datetime.date):
+        return value, ""
+    text = str(value or "").strip()
+    date = parse_date(text)
+    return date, "" if format_date(date) == text else text
+
+
+def format_date(date):
+    # The way thatsthem writes it, e.g. "January 5, 1970"
+    return f"{date:%B} {date.day}, {date.year}" if date else ""
+
+
+class ResultRecord:
+    # One result with typed fields: age is an int and date_of_birth a date, None when the
+    # source did not give one. ZIP codes stay strings, they have leading zeros. raw_address
+    # is only set when the address could not be fully parsed, raw_date_of_birth when the
+    # date of birth could not be parsed or was written another way.
+    __slots__ = list(TABLE_FIELDS.values())
+
+    def __init__(self, name="", phone_number="", address="", city="", state="", zip_code="", country="",
+                 date_of_birth=None, age=None, raw_address="", raw_date_of_birth=""):
+        self.name = name
+        self.phone_number = phone_number
+        self.address = address
+        self.city = city
+        self.state = state
+        self.zip_code = zip_code
+        self.country = country
+        self.date_of_birth = date_of_birth
+        self.age = age
+        self.raw_address = raw_address
+        self.raw_date_of_birth = raw_date_of_birth or ""
+
+    @classmethod
+    def from_dict(cls, result):
+        date_of_birth, raw_date_of_birth = split_date(result.get("Date of Birth"))
+        return cls(result.get("Name", ""), result.get("Phone number", ""), result.get("Address", ""),
+                   result.get("City", ""), result.get("State", ""), result.get("Zip Code", ""),
+                   result.get("Country", ""), date_of_birth, parse_age(result.get("Age")),
+                   result.get("Raw Address", ""), result.get(RAW_DATE_COLUMN) or raw_date_of_birth)
+
+    def get(self, column, default=""):
+        # Reads like the result dicts, so a record can go anywhere a result can
+        value = getattr(self, FIELDS[column]) if column in FIELDS else None
+        if column == "Date of Birth":
+            return self.raw_date_of_birth or format_date(value) or default
+        if value is None or value == "":
+            return default
+        return str(value) if column == "Age" else value
+
+    def to_dict(self):
+        return {column: self.get(column) for column in RESULT_COLUMNS if self.get(column)}
+
+    def __repr__(self):
+        return f"ResultRecord({', '.join(f'{field}={getattr(self, field)!r}' for field in self.__slots__)})"
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("The columnar result table needs pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def result_schema(pa):
+    # State and country repeat a handful of values, so they are dictionary-encoded
+    return pa.schema([
+        ("Name", pa.string()),
+        ("Phone number", pa.string()),
+        ("Address", pa.string()),
+        ("City", pa.string()),
+        ("State", pa.dictionary(pa.int16(), pa.string())),
+        ("Zip Code", pa.string()),
+        ("Country", pa.dictionary(pa.int8(), pa.string())),
+        ("Date of Birth", pa.date32()),
+        ("Age", pa.int16()),
+        ("Raw Address", pa.string()),
+        (RAW_DATE_COLUMN, pa.string()),
+    ])
+
+
+def to_record_batch(pa, records):
+    schema = result_schema(pa)
+    arrays = []
+    for column, field in zip(TABLE_FIELDS, schema):
+        values = [getattr(record, TABLE_FIELDS[column]) for record in records]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, pa.string()).dictionary_encode().cast(field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class ResultTable:
+    # Collects results into Arrow record batches of RECORD_BATCH_SIZE rows, typed as in
+    # result_schema, instead of a list of dicts that each repeat every key. Only the batch
+    # being filled is held as Python objects. Iterating gives the result dicts back, so
+    # it can stand in for the engine's result list; it also works as a sink.
+    def __init__(self, batch_size=RECORD_BATCH_SIZE, batches=None):
+        self.pa = require_pyarrow()
+        self.batch_size = batch_size
+        self.batches = list(batches or [])
+        self.pending = []
+        self.count = sum(batch.num_rows for batch in self.batches)
+
+    @classmethod
+    def from_table(cls, table):
+        pa = require_pyarrow()
+        try:
+            return cls(batches=table.cast(result_schema(pa)).to_batches())
+        except (ValueError, pa.ArrowException):
+            # Written before results were typed, every column a string, or with other columns
+            results = cls()
+            for row in table.to_pylist():
+                results.append(row)
+            return results
+
+    @classmethod
+    def read_parquet(cls, path):
+        import pyarrow.parquet as pq
+        return cls.from_table(pq.read_table(path))
+
+    def append(self, result):
+        self.pending.append(result if isinstance(result, ResultRecord) else ResultRecord.from_dict(result))
+        self.count += 1
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    write = append
+
+    def flush(self):
+        if self.pending:
+            self.batches.append(to_record_batch(self.pa, self.pending))
+            self.pending = []
+
+    def close(self):
+        self.flush()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for record in self.records():
+            yield record.to_dict()
+
+    def records(self):
+        self.flush()
+        for batch in self.batches:
+            for row in batch.to_pylist():
+                yield ResultRecord(*(row[column] for column in TABLE_FIELDS))
+
+    def table(self):
+        self.flush()
+        return self.pa.Table.from_batches(self.batches, schema=result_schema(self.pa))
+
+    def to_pandas(self):
+        # Arrow-backed columns, so the buffers are shared with pandas rather than copied
+        import pandas
+        return self.table().to_pandas(types_mapper=pandas.ArrowDtype)
+
+    def write_parquet(self, path):
+        import pyarrow.parquet as pq
+        pq.write_table(self.table(), path)
+
+    def filter(self, state=None, zip_prefix=None, min_age=None, max_age=None):
+        # A new table with the results that match every condition given
+        import pyarrow.compute as pc
+        table = self.table()
+        conditions = []
+        if state:
+            states = [state] if isinstance(state, str) else state
+            conditions.append(pc.is_in(pc.cast(table["State"], self.pa.string()),
+                                       value_set=self.pa.array([s.upper() for s in states])))
+        if zip_prefix:
+            conditions.append(pc.starts_with(table["Zip Code"], zip_prefix))
+        if min_age is not None:
+            conditions.append(pc.greater_equal(table["Age"], min_age))
+        if max_age is not None:
+            conditions.append(pc.less_equal(table["Age"], max_age))
+        if conditions:
+            mask = conditions[0]
+            for condition in conditions[1:]:
+                mask = pc.and_(mask, condition)
+            # Rows without the field (a null) never match
+            table = table.filter(pc.fill_null(mask, False))
+        return ResultTable.from_table(table)
+
+    def group_by(self, key, zip_digits=3, age_step=10):
+        # Result counts per state, per ZIP prefix (zip_digits long) or per age range
+        # (age_step years wide, labelled by its lowest age), most common first
+        import pyarrow.compute as pc
+        table = self.table()
+        if key == "state":
+            keys = pc.cast(table["State"], self.pa.string())
+        elif key == "zip_prefix":
+            keys = pc.utf8_slice_codeunits(table["Zip Code"], 0, zip_digits)
+        elif key == "age_range":
+            keys = pc.multiply(pc.divide(table["Age"], age_step), age_step)
+        else:
+            raise ValueError(f"Unknown group key: {key}, use one of {', '.join(GROUP_KEYS)}")
+        grouped = self.pa.table({key: keys, "Phone number": table["Phone number"]})
+        counts = grouped.group_by(key).aggregate([("Phone number", "count")])
+        counts = counts.rename_columns([key if name == key else "count" for name in counts.column_names])
+        return counts.sort_by([("count", "descending"), (key, "ascending")])
+
+
+def result_store():
+    # The engine's in-memory results: a ResultTable when pyarrow is there, a list if not
+    try:
+        return ResultTable()
+    except ImportError:
+        return []
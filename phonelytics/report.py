@@ -0,0 +1,34 @@
+import argparse
+import sys
+
+from .records import GROUP_KEYS, ResultTable
+
+# Filters and summarizes a typed Parquet results file (see phonelytics.records):
+#   python -m phonelytics.report results.parquet --state NC --min-age 30 --group-by zip_prefix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m phonelytics.report",
+                                     description="Filter and summarize a Parquet results file without opening it in Excel.")
+    parser.add_argument("input", help="results file written with -o results.parquet")
+    parser.add_argument("--state", nargs="+", help="keep only these states")
+    parser.add_argument("--zip-prefix", help="keep only ZIP codes starting with this")
+    parser.add_argument("--min-age", type=int)
+    parser.add_argument("--max-age", type=int)
+    parser.add_argument("--group-by", choices=GROUP_KEYS, help="print result counts per group")
+    parser.add_argument("-o", "--output", help="write the filtered results to this Parquet file")
+    args = parser.parse_args(argv)
+
+    results = ResultTable.read_parquet(args.input).filter(args.state, args.zip_prefix, args.min_age, args.max_age)
+    print(f"{len(results)} results")
+    if args.group_by:
+        for row in results.group_by(args.group_by).to_pylist():
+            print(f"{'-' if row[args.group_by] is None else row[args.group_by]:<10} {row['count']}")
+    if args.output:
+        results.write_parquet(args.output)
+        print(f"Results saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import csv
+from openpyxl import Workbook
+
+RESULT_COLUMNS = ["Name", "Phone number", "Address", "City", "State", "Zip Code", "Country", "Date of Birth", "Age",
+                  "Raw Address"]
+DEFAULT_BATCH_SIZE = 100
+
+
+class ResultSink:
+    # Buffers result dicts and hands them to write_batch every batch_size rows, so memory
+    # stays bounded by the batch no matter how many results the job produces.
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer = []
+        self.count = 0
+
+    def write(self, result):
+        self.buffer.append([result.get(column, "") for column in RESULT_COLUMNS])
+        self.count += 1
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.write_batch(self.buffer)
+            self.buffer = []
+
+    def write_batch(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvSink(ResultSink):
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(path, batch_size)
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(RESULT_COLUMNS)
+
+    def write_batch(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        super().close()
+        self.file.close()
+
+
+class ParquetSink(ResultSink):
+    # Each flushed batch becomes one row group, typed as in phonelytics.records
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+        from .records import ResultRecord, result_schema, to_record_batch
+        super().__init__(path, batch_size)
+        self.pa = pa
+        self.record = ResultRecord
+        self.to_record_batch = to_record_batch
+        self.writer = pq.ParquetWriter(path, result_schema(pa))
+
+    def write_batch(self, rows):
+        records = [self.record.from_dict(dict(zip(RESULT_COLUMNS, row))) for row in rows]
+        self.writer.write_batch(self.to_record_batch(self.pa, records))
+
+    def close(self):
+        super().close()
+        self.writer.close()
+
+
+class XlsxSink(ResultSink):
+    # openpyxl's write-only mode streams rows to a temporary file instead of keeping
+    # cells in memory; the workbook is assembled at path on close
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(path, batch_size)
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        self.sheet.append(RESULT_COLUMNS)
+
+    def write_batch(self, rows):
+        for row in rows:
+            self.sheet.append(row)
+
+    def close(self):
+        super().close()
+        self.workbook.save(self.path)
+
+
+SINKS = {
+    '.csv': CsvSink,
+    '.parquet': ParquetSink,
+    '.xlsx': XlsxSink,
+}
+
+
+def open_sink(path, batch_size=DEFAULT_BATCH_SIZE):
+    for extension, sink_class in SINKS.items():
+        if path.lower().endswith(extension):
+            return sink_class(path, batch_size)
+    raise ValueError(f"Unsupported output file type: {path}")
+
+
+def save_results(results, file_path):
+    # A ResultTable goes to Parquet as it is, without going back through dicts
+    if file_path.lower().endswith('.parquet') and hasattr(results, 'write_parquet'):
+        results.write_parquet(file_path)
+        return
+    with open_sink(file_path) as sink:
+        for result in results:
+            sink.write(result)
@@ -0,0 +1,224 @@
+import argparse
+import os
+import random
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from urllib.parse import parse_qs, urlparse
+
+# Local stand-in for both lookup sites, for benchmarks and offline runs. Pages only carry
+# the markup the scrapers rely on: the reverse.php form, result table and "searchform2"
+# no-results form of americaphonebook.com, and the form that opens results in a new tab,
+# .record markup and "No results found" page of thatsthem.com.
+
+AMERICANPHONEBOOK_PATH = "/reverse.php"
+THATSTHEM_PATH = "/reverse-phone-lookup"
+THATSTHEM_RESULTS_PATH = "/phone"
+
+AMERICANPHONEBOOK_SEARCH_PAGE = """<html><head><title>Reverse Phone Lookup</title></head><body>
+<form name="searchform" method="post" action="reverse.php">
+<input type="hidden" name="token" value="standin">
+<input type="text" name="number" value="">
+<input type="submit" name="submit" value="Search">
+</form>
+</body></html>"""
+
+AMERICANPHONEBOOK_RESULTS_PAGE = """<html><head><title>Reverse Phone Lookup</title></head><body>
+<h2>Here are your results</h2>
+<table>
+<tr><th>#</th><th>Name</th><th>Address</th><th>Phone</th></tr>
+<tr><td>1</td><td>{name}</td><td>{street}, {city}, {state}. {zip}</td><td>{number}</td></tr>
+</table>
+</body></html>"""
+
+AMERICANPHONEBOOK_NO_RESULTS_PAGE = """<html><head><title>Reverse Phone Lookup</title></head><body>
+<p>Sorry, we could not find that number.</p>
+<form name="searchform2" method="post" action="reverse.php">
+<input type="text" name="number" value="">
+<input type="submit" name="submit" value="Search">
+</form>
+</body></html>"""
+
+THATSTHEM_SEARCH_PAGE = f"""<html><head><title>Reverse Phone Lookup</title></head><body>
+<form method="get" action="{THATSTHEM_RESULTS_PATH}" target="_blank">
+<input type="text" class="form-control" name="phone" value="">
+</form>
+</body></html>"""
+
+THATSTHEM_RESULTS_PAGE = """<html><head><title>{number}</title></head><body>
+<div class="record">
+<div class="name">{name}</div>
+<div class="location"><span class="street">{street}</span> <span class="city">{city}</span>
+<span class="state">{state}</span> <span class="zip">{zip}+1234</span></div>
+<div class="age">Born {dob} ({age} years old)</div>
+</div>
+</body></html>"""
+
+THATSTHEM_NO_RESULTS_PAGE = """<html><head><title>{number}</title></head><body>
+<p>No results found</p>
+</body></html>"""
+
+# Every page also pulls in an image, a web font and a video like the real sites' banners
+# and ads do, so a lean browser profile shows up in the bytes served
+ASSETS = {
+    "/static/banner.jpg": "image/jpeg",
+    "/static/face.woff2": "font/woff2",
+    "/static/clip.mp4": "video/mp4",
+}
+ASSETS_HTML = """<style>@font-face { font-family: StandIn; src: url(/static/face.woff2); } body { font-family: StandIn; }</style>
+<img src="/static/banner.jpg" alt="">
+<video src="/static/clip.mp4" autoplay muted></video>
+"""
+
+FIRST_NAMES = ["JOHN", "MARY", "JAMES", "PATRICIA", "ROBERT", "LINDA"]
+LAST_NAMES = ["SMITH", "JOHNSON", "WILLIAMS", "BROWN", "JONES", "GARCIA"]
+CITIES = [("WILMINGTON", "NC", "28405"), ("AUSTIN", "TX", "73301"), ("DENVER", "CO", "80202")]
+
+
+def fake_person(number):
+    # The same number always gets the same person
+    rng = random.Random(number)
+    city, state, zip_code = rng.choice(CITIES)
+    age = rng.randint(20, 90)
+    return {
+        "number": number,
+        "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "street": f"{rng.randint(1, 9999)} MAIN ST",
+        "city": city,
+        "state": state,
+        "zip": zip_code,
+        "dob": f"January {rng.randint(1, 28)}, {2025 - age}",
+        "age": age,
+    }
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path in ASSETS:
+            self.respond_bytes(self.server.settings.asset_body, ASSETS[url.path])
+        elif url.path == AMERICANPHONEBOOK_PATH:
+            self.respond(AMERICANPHONEBOOK_SEARCH_PAGE)
+        elif url.path == THATSTHEM_PATH:
+            self.respond(THATSTHEM_SEARCH_PAGE)
+        elif url.path == THATSTHEM_RESULTS_PATH:
+            number = parse_qs(url.query).get("phone", [""])[0]
+            self.lookup(number, THATSTHEM_RESULTS_PAGE, THATSTHEM_NO_RESULTS_PAGE)
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if urlparse(self.path).path != AMERICANPHONEBOOK_PATH:
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        number = parse_qs(self.rfile.read(length).decode("utf-8")).get("number", [""])[0]
+        self.lookup(number, AMERICANPHONEBOOK_RESULTS_PAGE, AMERICANPHONEBOOK_NO_RESULTS_PAGE)
+
+    def lookup(self, number, results_page, no_results_page):
+        settings = self.server.settings
+        delay = settings.latency + random.uniform(0, settings.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if random.random() < settings.error_rate:
+            self.send_error(503, "Injected error")
+            return
+        number = "".join(c for c in number if c.isdigit())
+        if number and random.Random(f"hit-{number}").random() < settings.hit_rate:
+            self.respond(results_page.format(**fake_person(number)))
+        else:
+            self.respond(no_results_page.format(number=number))
+
+    def respond(self, page):
+        if self.server.settings.asset_body:
+            page = page.replace("</body>", ASSETS_HTML + "</body>")
+        self.respond_bytes(page.encode("utf-8"), "text/html; charset=utf-8")
+
+    def respond_bytes(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.settings.count_bytes(len(body))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    # Serves both sites from one local port. Every search waits latency seconds plus up to
+    # jitter seconds, fails with a 503 at error_rate, and finds a match for hit_rate of the
+    # numbers (always the same ones). Each of the three page assets is asset_kb kilobytes;
+    # bytes_sent counts every response body. port=0 picks a free port.
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0, hit_rate=0.5, asset_kb=100):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.hit_rate = hit_rate
+        self.asset_body = os.urandom(int(asset_kb * 1024))
+        self.bytes_sent = 0
+        self.lock = Lock()
+        self.httpd = ThreadingHTTPServer((host, port), StandInHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.settings = self
+        self.thread = None
+
+    def count_bytes(self, size):
+        with self.lock:
+            self.bytes_sent += size
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def americanphonebook_url(self):
+        return self.base_url + AMERICANPHONEBOOK_PATH
+
+    @property
+    def thatsthem_url(self):
+        return self.base_url + THATSTHEM_PATH
+
+    def start(self):
+        self.thread = Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m phonelytics.standin", description="Serve local stand-ins for the lookup sites.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds every search takes (default %(default)s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra random seconds per search")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of searches answered with a 503")
+    parser.add_argument("--hit-rate", type=float, default=0.5, help="fraction of numbers that have a match (default %(default)s)")
+    parser.add_argument("--asset-kb", type=float, default=100, help="size of each image, font and video a page loads, 0 for none (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    server = StandInServer(port=args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           hit_rate=args.hit_rate, asset_kb=args.asset_kb)
+    print(f"americaphonebook stand-in: {server.americanphonebook_url}")
+    print(f"thatsthem stand-in: {server.thatsthem_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from .extract import extract_thatsthem
+from .failures import LookupFailed
+from .metrics import timed
+from .probe import PageProbe, is_ready, is_answered
+
+SEARCH_URL = "https://thatsthem.com/reverse-phone-lookup"
+
+PROBE = PageProbe(
+    results_selectors=[".record"],
+    no_results_markers=["no results found"],
+    # Common verification elements or text
+    verification_selectors=["#recaptcha", ".g-recaptcha", "iframe[src*=captcha]"],
+    verification_markers=["verify you are not a robot", "prove you are human", "sign up to continue", "captcha", "recaptcha"],
+)
+
+
+class ThatsthemScraper:
+    name = "thatsthem"
+    uses_driver = True
+
+    def __init__(self, page_timeout=30, search_url=SEARCH_URL):
+        self.page_timeout = page_timeout
+        self.search_url = search_url
+
+    def close_result_tabs(self, driver, original_window):
+        # Back to the search tab after a failure; if that fails too, the engine's watchdog
+        # closes whatever is left once the lookup is over
+        if original_window is None:
+            return
+        try:
+            for window_handle in driver.window_handles:
+                if window_handle != original_window:
+                    driver.switch_to.window(window_handle)
+                    driver.close()
+            driver.switch_to.window(original_window)
+        except Exception:
+            pass
+
+    def scrape_phone_info(self, driver, number, engine=None):
+        original_window = None
+        try:
+            print(f"Navigating to thatsthem.com/reverse-phone-lookup for {number}")
+            wait = WebDriverWait(driver, self.page_timeout)
+            with timed(engine, self.name, number, "navigate"):
+                driver.get(self.search_url)
+                print(f"Waiting for page to be ready for {number}")
+                state = PROBE.wait_for(wait, is_ready)
+            
+            # Check for human verification
+            if state["verification"]:
+                print(f"Human verification detected for {number}")
+                if not engine or not engine.wait_for_verification(number):
+                    raise LookupFailed("Human verification was not completed")
+
+            print(f"Locating search box for {number}")
+            # Class 'form-control' with a plain text input as fallback, whichever shows up first
+            with timed(engine, self.name, number, "locate"):
+                search_box = wait.until(EC.any_of(
+                    EC.presence_of_element_located((By.CLASS_NAME, "form-control")),
+                    EC.presence_of_element_located((By.XPATH, "//input[@type='text']"))))
+
+            print(f"Typing {number}")
+            with timed(engine, self.name, number, "type"):
+                driver.execute_script("arguments[0].click();", search_box)
+                search_box.clear()
+                search_box.send_keys(number)
+
+            original_window = driver.current_window_handle
+            print(f"Original window handle: {original_window}")
+
+            print(f"Submitting search for {number}")
+            with timed(engine, self.name, number, "submit"):
+                search_box.send_keys(Keys.RETURN)
+
+            print(f"Switching to new tab for {number}")
+            with timed(engine, self.name, number, "tab_switch"):
+                wait.until(EC.number_of_windows_to_be(2))
+                for window_handle in driver.window_handles:
+                    if window_handle != original_window:
+                        driver.switch_to.window(window_handle)
+                        break
+            print(f"Switched to new window handle: {driver.current_window_handle}")
+
+            print(f"Waiting for results or no-results message for {number}")
+            with timed(engine, self.name, number, "result_wait"):
+                state = PROBE.wait_for(wait, is_answered)
+
+            # Check for human verification again on results page
+            if state["verification"]:
+                print(f"Human verification detected on results page for {number}")
+                if not engine or not engine.wait_for_verification(number):
+                    driver.close()
+                    driver.switch_to.window(original_window)
+                    raise LookupFailed("Human verification was not completed")
+                state = PROBE.wait_for(wait, lambda state: state["results"] or state["no_results"])
+
+            if state["no_results"]:
+                print(f"No results found for {number}")
+                driver.close()
+                driver.switch_to.window(original_window)
+                return {}
+
+            print(f"Scraping data from results page for {number}")
+            with timed(engine, self.name, number, "extract"):
+                page = driver.page_source
+                driver.close()
+                driver.switch_to.window(original_window)
+                result = extract_thatsthem(page, number)
+            if not result:
+                print(f"No name found for {number}")
+                return {}
+
+            print(f"Success for {number}: {result['Name']}")
+            return result
+        except Exception as e:
+            if isinstance(e, (TimeoutException, WebDriverException)):
+                print(f"Network or driver error for {number}: {str(e)}")
+            self.close_result_tabs(driver, original_window)
+            raise
@@ -0,0 +1,161 @@
+import os
+from threading import Lock
+
+DEFAULT_RECYCLE_AFTER = 500
+DEFAULT_MAX_RSS_MB = 1500
+# How many lookups go by between two memory readings of a browser
+RSS_CHECK_EVERY = 10
+
+
+def process_tree_rss(pid):
+    # Resident memory of a process and everything it started (geckodriver -> Firefox and
+    # its content processes), or None without psutil
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        process = psutil.Process(pid)
+        total = process.memory_info().rss
+        children = process.children(recursive=True)
+    except psutil.Error:
+        return None
+    for child in children:
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass  # Exited between listing and reading it
+    return total
+
+
+def driver_pid(driver):
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    return getattr(process, "pid", None)
+
+
+def kill_process_tree(pid):
+    if not pid:
+        return
+    try:
+        import psutil
+        process = psutil.Process(pid)
+        for child in process.children(recursive=True):
+            child.kill()
+        process.kill()
+    except Exception:
+        pass  # No psutil, or it is already gone
+
+
+def kill_orphaned_geckodrivers():
+    # geckodriver processes of this user whose parent has gone away (a crashed or killed
+    # run) are killed together with the browser they started. Needs psutil.
+    try:
+        import psutil
+    except ImportError:
+        return 0
+    killed = 0
+    for process in psutil.process_iter(["name", "ppid", "uids"]):
+        try:
+            if "geckodriver" not in (process.info["name"] or ""):
+                continue
+            if hasattr(os, "getuid") and process.info["uids"] and process.info["uids"].real != os.getuid():
+                continue
+            ppid = process.info["ppid"]
+            if ppid == os.getpid() or (ppid not in (0, 1) and psutil.pid_exists(ppid)):
+                continue
+            kill_process_tree(process.pid)
+            killed += 1
+        except psutil.Error:
+            pass
+    return killed
+
+
+class DriverWatchdog:
+    # Keeps long jobs from wearing a browser down. After every lookup it closes any window
+    # left open besides the worker's first one and tells the engine to replace the
+    # browser once it has done recycle_after lookups or its process tree (geckodriver and
+    # Firefox) passes max_rss_mb. Either limit can be turned off with 0. Orphaned
+    # geckodrivers from earlier runs are killed when a job starts.
+    def __init__(self, recycle_after=DEFAULT_RECYCLE_AFTER, max_rss_mb=DEFAULT_MAX_RSS_MB):
+        self.recycle_after = recycle_after
+        self.max_rss_mb = max_rss_mb
+        self.lock = Lock()
+        self.reset()
+
+    @classmethod
+    def from_config(cls, site_config):
+        return cls(site_config.get("recycle_after", DEFAULT_RECYCLE_AFTER), site_config.get("max_rss_mb", DEFAULT_MAX_RSS_MB))
+
+    def reset(self):
+        self.recycled = 0
+        self.recycled_for_memory = 0
+        self.leaked_tabs = 0
+        self.orphans_killed = 0
+        self.peak_rss = 0
+
+    def start_job(self):
+        self.reset()
+        killed = kill_orphaned_geckodrivers()
+        if killed:
+            print(f"Killed {killed} orphaned geckodriver processes")
+        self.orphans_killed += killed
+
+    def started(self, state, driver):
+        # state is the worker's thread-local; it remembers the window lookups start from
+        try:
+            state.home_window = driver.current_window_handle
+        except Exception:
+            state.home_window = None  # The first window left open after a lookup is kept
+        state.lookups = 0
+
+    def close_leaked_tabs(self, state, driver):
+        handles = driver.window_handles
+        home = getattr(state, "home_window", None)
+        if home not in handles:
+            home = handles[0] if handles else None
+        leaked = [handle for handle in handles if handle != home]
+        for handle in leaked:
+            driver.switch_to.window(handle)
+            driver.close()
+        if home is not None and (leaked or driver.current_window_handle != home):
+            driver.switch_to.window(home)
+        state.home_window = home
+        if leaked:
+            with self.lock:
+                self.leaked_tabs += len(leaked)
+        return len(leaked)
+
+    def check(self, state, driver):
+        # Returns why the browser should be replaced now, or None
+        state.lookups = getattr(state, "lookups", 0) + 1
+        self.close_leaked_tabs(state, driver)
+        if self.max_rss_mb and state.lookups % RSS_CHECK_EVERY == 0:
+            pid = driver_pid(driver)
+            rss = process_tree_rss(pid) if pid else None
+            if rss is not None:
+                with self.lock:
+                    self.peak_rss = max(self.peak_rss, rss)
+                if rss > self.max_rss_mb * 1024 * 1024:
+                    with self.lock:
+                        self.recycled += 1
+                        self.recycled_for_memory += 1
+                    return f"browser uses {rss / 1024 / 1024:.0f} MB"
+        if self.recycle_after and state.lookups >= self.recycle_after:
+            with self.lock:
+                self.recycled += 1
+            return f"{state.lookups} lookups done"
+        return None
+
+    def summary(self):
+        with self.lock:
+            parts = []
+            if self.recycled:
+                parts.append(f"Browser recycles: {self.recycled} ({self.recycled_for_memory} for memory)")
+            if self.leaked_tabs:
+                parts.append(f"Leaked tabs closed: {self.leaked_tabs}")
+            if self.orphans_killed:
+                parts.append(f"Orphaned geckodrivers killed: {self.orphans_killed}")
+            if self.peak_rss:
+                parts.append(f"Peak browser memory: {self.peak_rss / 1024 / 1024:.0f} MB")
+            return " | ".join(parts)